@@ -0,0 +1,101 @@
+"""
+Benchmark Fixtures - Synthetic scope cards, canons and overlays
+
+Inputs scale with a single ``size`` parameter so each benchmark can be run
+at increasing sizes. NotebookLM is replaced by StubNotebookLM, which
+returns a synthetic canon without any I/O, or by StubNotebookLMBackend,
+which answers NotebookLMIntegration queries after a fixed round-trip delay.
+"""
+
+import asyncio
+import re
+import sys
+from pathlib import Path
+from typing import Dict
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+# Scope card sizes: number of items per list
+SIZES = {
+    "small": 3,
+    "medium": 30,
+    "large": 300,
+}
+
+
+def make_scope_card(size: int) -> Dict:
+    """Synthetic scope card with ``size`` items per list (min. valid sizes)."""
+    return {
+        "goal": f"Automate synthetic workflow number {size} for benchmark runs",
+        "trigger_words": [f"trigger phrase {i}" for i in range(max(size, 5))],
+        "must_cover": [f"covered scenario {i}" for i in range(size)],
+        "must_not_cover": [f"excluded scenario {i}" for i in range(size)],
+        "output_form": "template",
+        "success_criteria": [f"criterion {i}" for i in range(max(size // 3, 1))],
+    }
+
+
+def make_canon(size: int) -> Dict:
+    """Synthetic external canon with ``size`` entries per section."""
+    return {
+        "notebook_id": f"bench_notebook_{size}",
+        "sources": [{"title": f"Source {i}", "url": "N/A", "relevance": "primary"} for i in range(3)],
+        "quickstart": "\n".join(f"Step {i}: do thing {i}" for i in range(1, 4)),
+        "decision_points": [f"If condition {i} then use approach {i}" for i in range(size)],
+        "templates": [
+            {"name": f"Template {i}", "content": f"tool-{i % 7} --input data_{i}.csv --output out_{i}.json"}
+            for i in range(size)
+        ],
+        "failure_modes": [
+            {"symptom": f"Symptom {i}: job fails with error E{i}", "fix": f"Rerun step {i} with --retry"}
+            for i in range(max(size, 5))
+        ],
+        "edge_cases": [f"Edge case {i}: empty or malformed input {i}" for i in range(size)],
+    }
+
+
+def make_overlay(size: int) -> Dict:
+    """Synthetic local overlay with ``size`` tools per list."""
+    return {
+        "compliance_constraints": "No customer data leaves the VPC. All outputs are reviewed.",
+        "required_tools": [f"tool-{i}" for i in range(size)],
+        "forbidden_tools": [f"banned-tool-{i}" for i in range(size)],
+        "output_format": {"description": "JSON with keys id, name, value", "example": "{}"},
+        "priority": "accuracy",
+        "failure_history": [f"Historic failure {i}" for i in range(3)],
+    }
+
+
+class StubNotebookLM:
+    """Drop-in for NotebookLMIntegration that returns a synthetic canon."""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    async def collect_canon(self, scope_card: Dict) -> Dict:
+        return make_canon(self.size)
+
+
+class StubNotebookLMBackend:
+    """NotebookLMIntegration backend answering every query after ``latency`` seconds."""
+
+    def __init__(self, size: int, latency: float = 0.002):
+        self.size = size
+        self.latency = latency
+
+    async def create_notebook(self, name: str, document: str) -> str:
+        await asyncio.sleep(self.latency)
+        return f"bench_notebook_{self.size}"
+
+    async def query(self, notebook_id: str, question: str) -> str:
+        await asyncio.sleep(self.latency)
+        # Batched prompts list one "### category" header per question
+        categories = re.findall(r"^### (\w+)$", question, re.MULTILINE)
+        if categories:
+            return "\n\n".join(f"### {c}\n{self._answer(c)}" for c in categories)
+        return self._answer("answer")
+
+    def _answer(self, label: str) -> str:
+        return "\n".join(f"{label} line {i}" for i in range(max(self.size, 5)))
@@ -0,0 +1,190 @@
+"""
+Benchmark Harness - Timing, memory and baseline comparison
+
+Measures a callable (sync or async) over repeated iterations and reports
+ops/sec, p50/p95 latency and peak traced memory. Results are stored as
+baselines keyed by git commit, so a run can be compared with the previous
+commit's numbers.
+"""
+
+import asyncio
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one benchmark case."""
+    name: str
+    iterations: int
+    ops_per_sec: float
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+    peak_memory_kb: float
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample list."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class BenchmarkRunner:
+    """Runs benchmark cases on one event loop and collects results."""
+
+    def __init__(self, iterations: int = 50, warmup: int = 3):
+        """
+        Initialize the runner.
+
+        Args:
+            iterations: Timed iterations per case
+            warmup: Untimed iterations run first
+        """
+        self.iterations = iterations
+        self.warmup = warmup
+        self.loop = asyncio.new_event_loop()
+        self.results: List[BenchmarkResult] = []
+
+    def close(self) -> None:
+        self.loop.close()
+
+    def _call(self, fn: Callable[[], Any]) -> Any:
+        result = fn()
+        if asyncio.iscoroutine(result):
+            result = self.loop.run_until_complete(result)
+        return result
+
+    def run(self, name: str, fn: Callable[[], Any], iterations: Optional[int] = None) -> BenchmarkResult:
+        """
+        Benchmark ``fn`` (a zero-argument callable, sync or async).
+
+        Latency is measured without tracemalloc; peak memory is measured in
+        a separate single iteration, since tracing slows allocation heavily.
+        """
+        iterations = iterations or self.iterations
+
+        for _ in range(self.warmup):
+            self._call(fn)
+
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            self._call(fn)
+            samples.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            self._call(fn)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        total = sum(samples)
+        result = BenchmarkResult(
+            name=name,
+            iterations=iterations,
+            ops_per_sec=round(iterations / total, 2) if total > 0 else float("inf"),
+            p50_ms=round(_percentile(samples, 50) * 1000, 4),
+            p95_ms=round(_percentile(samples, 95) * 1000, 4),
+            mean_ms=round(statistics.mean(samples) * 1000, 4),
+            peak_memory_kb=round(peak / 1024, 1),
+        )
+        self.results.append(result)
+        return result
+
+
+def git_commit(ref: str = "HEAD") -> Optional[str]:
+    """Resolve a git ref to a commit hash, or None outside a git checkout."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", ref],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def build_report(results: List[BenchmarkResult]) -> Dict:
+    """Report dict for a benchmark run."""
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {r.name: asdict(r) for r in results},
+    }
+
+
+def save_baseline(report: Dict, baseline_dir: Path = BASELINE_DIR) -> Path:
+    """Store a report as the baseline for its commit."""
+    baseline_dir.mkdir(parents=True, exist_ok=True)
+    path = baseline_dir / f"{report['commit'] or 'working-tree'}.json"
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def load_baseline(ref: str, baseline_dir: Path = BASELINE_DIR) -> Optional[Dict]:
+    """Load the baseline stored for a git ref (e.g. HEAD~1), if any."""
+    commit = git_commit(ref) or ref
+    path = baseline_dir / f"{commit}.json"
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(report: Dict, baseline: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Compare a report with a baseline.
+
+    Returns:
+        One row per case present in both: name, baseline and current p50,
+        relative change, and whether it regressed by more than ``threshold``
+    """
+    rows = []
+    for name, current in report["results"].items():
+        previous = baseline["results"].get(name)
+        if not previous or not previous["p50_ms"]:
+            continue
+        change = (current["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"]
+        rows.append({
+            "name": name,
+            "baseline_p50_ms": previous["p50_ms"],
+            "current_p50_ms": current["p50_ms"],
+            "change": round(change, 4),
+            "regressed": change > threshold,
+        })
+    return rows
+
+
+def print_results(results: List[BenchmarkResult]) -> None:
+    """Print results as a table."""
+    header = f"{'benchmark':<48} {'ops/sec':>10} {'p50 ms':>10} {'p95 ms':>10} {'peak KiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r.name:<48} {r.ops_per_sec:>10.1f} {r.p50_ms:>10.3f} {r.p95_ms:>10.3f} {r.peak_memory_kb:>10.1f}")
+
+
+def print_comparison(rows: List[Dict], baseline: Dict) -> None:
+    """Print a baseline comparison table."""
+    print(f"\nCompared with baseline {str(baseline.get('commit'))[:12]} (p50):")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"  {row['name']:<46} {row['baseline_p50_ms']:>10.3f} -> {row['current_p50_ms']:>10.3f} ms "
+              f"({row['change']:+.1%}){flag}")
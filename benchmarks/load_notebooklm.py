@@ -0,0 +1,108 @@
+"""
+NotebookLM Load Test - Step 3 against the local fake NotebookLM service
+
+Runs many ``collect_canon`` calls concurrently against the fake backend
+(in-process or stdio workers) and reports throughput, latency, and the
+rate limiter, cache and backend counters.
+
+Usage:
+    python benchmarks/load_notebooklm.py --runs 50 --concurrency 10
+    python benchmarks/load_notebooklm.py --backend fake-stdio --workers 4 --throttle-rate 0.1
+    python benchmarks/load_notebooklm.py --max-qps 20 --cache
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import time
+
+from fixtures import make_scope_card
+from harness import _percentile
+
+from notebooklm_integration import NotebookLMIntegration
+from rate_limiter import AdaptiveLimiter
+
+
+async def run_load(args) -> dict:
+    cache_dir = tempfile.mkdtemp(prefix="skillforge-load-") if args.cache else None
+    integration = NotebookLMIntegration(
+        backend=args.backend,
+        workers=args.workers,
+        cache_dir=cache_dir,
+        # Answers are cached per notebook, so repeats must reuse notebooks to hit
+        registry_path=f"{cache_dir}/notebooks.json" if cache_dir else None,
+        batch_questions=args.batched,
+        fake_options={
+            "latency": args.latency,
+            "error_rate": args.error_rate,
+            "throttle_rate": args.throttle_rate,
+            "max_qps": args.max_qps,
+            "max_concurrent": args.max_concurrent,
+            "seed": args.seed,
+        },
+        rate_limiter=AdaptiveLimiter(rate=args.rate, burst=args.burst) if args.rate else None,
+    )
+
+    # --distinct scope cards; repeats exercise the answer cache
+    scope_cards = [make_scope_card(i + 3) for i in range(args.distinct)]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await integration.collect_canon(scope_cards[i % len(scope_cards)])
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(i) for i in range(args.runs)))
+    finally:
+        elapsed = time.perf_counter() - started
+        backend_stats = integration.backend.stats()
+        await integration.aclose()
+        if cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return {
+        "runs": args.runs,
+        "elapsed_seconds": round(elapsed, 3),
+        "runs_per_sec": round(args.runs / elapsed, 2),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "limiter": integration.limiter_stats(),
+        "cache": integration.cache_stats(),
+        "backend": backend_stats,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test Step 3 against the fake NotebookLM service")
+    parser.add_argument("--backend", choices=["fake", "fake-stdio"], default="fake")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes for fake-stdio")
+    parser.add_argument("--runs", type=int, default=50, help="collect_canon calls")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent collect_canon calls")
+    parser.add_argument("--distinct", type=int, default=10, help="Distinct scope cards cycled through")
+    parser.add_argument("--batched", action="store_true", help="Use the batched query mode")
+    parser.add_argument("--cache", action="store_true", help="Enable the answer cache and notebook reuse")
+    parser.add_argument("--latency", default="lognormal:0.05,0.5", help="Fake latency distribution spec")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-qps", type=float, help="Fake service throttles above this rate")
+    parser.add_argument("--max-concurrent", type=int, help="Fake service throttles above this many in flight")
+    parser.add_argument("--rate", type=float, default=50.0, help="Client limiter rate (0 disables the limiter)")
+    parser.add_argument("--burst", type=int, default=20, help="Client limiter burst")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(json.dumps(asyncio.run(run_load(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+SkillForge Benchmarks - End-to-end and per-engine performance suite
+
+Drives the non-interactive pipeline (``generate_skill(interactive=False)``)
+and each sub-engine in isolation against synthetic inputs of increasing
+size, with NotebookLM stubbed out.
+
+Usage:
+    python benchmarks/run_benchmarks.py                  # run all, print table
+    python benchmarks/run_benchmarks.py --save           # store baseline for HEAD
+    python benchmarks/run_benchmarks.py --compare HEAD~1 # diff against a baseline
+    python benchmarks/run_benchmarks.py -k compile       # only matching cases
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+from typing import Callable, List, Tuple
+
+from fixtures import (
+    SIZES, StubNotebookLM, StubNotebookLMBackend, make_canon, make_overlay, make_scope_card,
+)
+from harness import (
+    BenchmarkRunner, build_report, compare, load_baseline, print_comparison,
+    print_results, save_baseline,
+)
+
+from notebooklm_integration import NotebookLMIntegration
+from skill_compiler import SkillCompiler
+from skillforge_engine import SkillForgeEngine
+from validators import SkillValidator
+
+# (case name, factory) pairs; a factory takes a size and returns the
+# zero-argument callable to time
+BENCHMARKS: List[Tuple[str, Callable[[int], Callable]]] = []
+
+# Storage directories created by cases, removed after the run
+TEMP_DIRS: List[str] = []
+
+
+def benchmark(name: str):
+    """Register a benchmark case, run once per entry in SIZES."""
+    def register(factory):
+        BENCHMARKS.append((name, factory))
+        return factory
+    return register
+
+
+@benchmark("engine.generate_skill")
+def bench_generate_skill(size: int) -> Callable:
+    storage_dir = tempfile.mkdtemp(prefix="skillforge-bench-")
+    engine = SkillForgeEngine(storage_dir)
+    engine._notebooklm_integration = StubNotebookLM(size)
+    request = make_scope_card(size)["goal"]
+    TEMP_DIRS.append(storage_dir)
+    return lambda: engine.generate_skill(request, interactive=False)
+
+
+@benchmark("compiler.compile")
+def bench_compile(size: int) -> Callable:
+    # Full render every time; reuse is measured by .incremental
+    compiler = SkillCompiler(incremental=False)
+    scope_card, canon, overlay = make_scope_card(size), make_canon(size), make_overlay(size)
+    return lambda: compiler.compile(scope_card, canon, overlay)
+
+
+@benchmark("compiler.compile.thousands")
+def bench_compile_thousands(size: int) -> Callable:
+    # 10x entries per canon section and overlay tool list (3000 at "large")
+    compiler = SkillCompiler(incremental=False)
+    scope_card, canon, overlay = make_scope_card(size), make_canon(size * 10), make_overlay(size * 10)
+    return lambda: compiler.compile(scope_card, canon, overlay)
+
+
+@benchmark("compiler.compile.incremental")
+def bench_compile_incremental(size: int) -> Callable:
+    compiler = SkillCompiler()
+    scope_card, canon, overlay = make_scope_card(size), make_canon(size), make_overlay(size)
+    priorities = ["accuracy", "speed"]
+
+    def recompile():
+        # An interactive overlay edit: only "When to Use" reads the priority
+        priorities.reverse()
+        overlay["priority"] = priorities[0]
+        return compiler.compile(scope_card, canon, overlay)
+
+    compiler.compile(scope_card, canon, overlay)
+    return recompile
+
+
+@benchmark("compiler.compile_many")
+def bench_compile_many(size: int) -> Callable:
+    # 20 skills sharing one organization's overlay
+    compiler = SkillCompiler(incremental=False)
+    scope_cards = [dict(make_scope_card(size), goal=f"Skill {i}") for i in range(20)]
+    canons = [make_canon(size) for _ in range(20)]
+    overlay = make_overlay(size * 10)
+    return lambda: compiler.compile_many(scope_cards, canons, overlay)
+
+
+@benchmark("compiler.detect_conflicts")
+def bench_detect_conflicts(size: int) -> Callable:
+    # ``size`` required and forbidden tools against 10x canon entries
+    compiler = SkillCompiler()
+    scope_card, canon, overlay = make_scope_card(size), make_canon(size * 10), make_overlay(size)
+    return lambda: compiler.detect_conflicts(scope_card, canon, overlay)
+
+
+@benchmark("validator.validate_skill")
+def bench_validate(size: int) -> Callable:
+    validator = SkillValidator()
+    scope_card, canon = make_scope_card(size), make_canon(size)
+    skill_md = SkillCompiler().compile(scope_card, canon, make_overlay(size))
+    return lambda: validator.validate_skill(skill_md, scope_card, canon)
+
+
+@benchmark("notebooklm.collect_canon")
+def bench_collect_canon(size: int) -> Callable:
+    integration = NotebookLMIntegration()
+    scope_card = make_scope_card(size)
+    return lambda: integration.collect_canon(scope_card)
+
+
+@benchmark("notebooklm.collect_canon.per_question")
+def bench_collect_canon_per_question(size: int) -> Callable:
+    integration = NotebookLMIntegration(backend=StubNotebookLMBackend(size), rate_limiter=None)
+    scope_card = make_scope_card(size)
+    return lambda: integration.collect_canon(scope_card, batched=False)
+
+
+@benchmark("notebooklm.collect_canon.batched")
+def bench_collect_canon_batched(size: int) -> Callable:
+    integration = NotebookLMIntegration(backend=StubNotebookLMBackend(size), rate_limiter=None)
+    scope_card = make_scope_card(size)
+    return lambda: integration.collect_canon(scope_card, batched=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run SkillForge benchmarks")
+    parser.add_argument("-k", dest="pattern", help="Only run cases whose name contains this string")
+    parser.add_argument("-n", "--iterations", type=int, default=50, help="Timed iterations per case")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"Comma-separated sizes ({', '.join(SIZES)})")
+    parser.add_argument("--save", action="store_true", help="Store results as the baseline for HEAD")
+    parser.add_argument("--compare", metavar="REF", help="Compare with the baseline stored for a git ref (e.g. HEAD~1)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative p50 slowdown counted as a regression")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    # Keep pipeline logging out of the timings and the output
+    logging.disable(logging.CRITICAL)
+
+    runner = BenchmarkRunner(iterations=args.iterations)
+    sizes = {name: SIZES[name] for name in args.sizes.split(",")}
+    try:
+        for name, factory in BENCHMARKS:
+            for size_name, size in sizes.items():
+                case = f"{name}[{size_name}]"
+                if args.pattern and args.pattern not in case:
+                    continue
+                runner.run(case, factory(size))
+    finally:
+        runner.close()
+        for storage_dir in TEMP_DIRS:
+            shutil.rmtree(storage_dir, ignore_errors=True)
+
+    print_results(runner.results)
+    report = build_report(runner.results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save:
+        print(f"\nBaseline saved to {save_baseline(report)}")
+
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline is None:
+            print(f"\nNo baseline stored for {args.compare}; run with --save on that commit first")
+            return 1
+        rows = compare(report, baseline, threshold=args.threshold)
+        print_comparison(rows, baseline)
+        if any(row["regressed"] for row in rows):
+            return 2
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,14 +10,14 @@ Automated skill generation engine with 6-step orchestration:
 6. Skill Compilation
 """
 
-from .skillforge_engine import SkillForgeEngine
+from .skillforge_engine import SkillForgeEngine, __version__
 from .skill_compiler import SkillCompiler
 from .notebooklm_integration import NotebookLMIntegration
 from .scope_card_builder import ScopeCardBuilder
 from .user_interview import UserInterview
 from .validators import SkillValidator
+from .skillforge_server import SkillForgeServer, SkillForgeClient
 
-__version__ = "1.0.0"
 __all__ = [
     "SkillForgeEngine",
     "SkillCompiler",
@@ -25,4 +25,6 @@ __all__ = [
     "ScopeCardBuilder",
     "UserInterview",
     "SkillValidator",
+    "SkillForgeServer",
+    "SkillForgeClient",
 ]
@@ -0,0 +1,153 @@
+"""
+Artifact Store - Content-addressed storage for generated skills
+
+Generated skills are stored by the hash of their content rather than by
+timestamp:
+
+    <root>/objects/<hh>/<hash>/SKILL.md
+    <root>/objects/<hh>/<hash>/metadata.json
+    <root>/manifest.jsonl               # one line per run: run_id -> hash
+
+Identical outputs share one object directory, and concurrent writers never
+collide: objects are written to a private temp directory and renamed into
+place, and manifest lines are appended with a single write.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactStore:
+    """Content-addressed store of SKILL.md files and their metadata."""
+
+    OBJECTS_DIR = "objects"
+    MANIFEST_FILE = "manifest.jsonl"
+
+    # Keys that differ between runs of the same content and are left out of
+    # the content hash
+    VOLATILE_KEYS = {"created_at"}
+
+    def __init__(self, root: str):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / self.OBJECTS_DIR
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.root / self.MANIFEST_FILE
+
+    @classmethod
+    def normalize(cls, value: Any) -> Any:
+        """Drop volatile keys (timestamps) recursively."""
+        if isinstance(value, dict):
+            return {k: cls.normalize(v) for k, v in value.items() if k not in cls.VOLATILE_KEYS}
+        if isinstance(value, list):
+            return [cls.normalize(v) for v in value]
+        return value
+
+    @staticmethod
+    def content_hash(skill_md: str, metadata: Dict) -> str:
+        """Hash of SKILL.md and its (normalized) metadata."""
+        digest = hashlib.sha256()
+        digest.update(skill_md.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(json.dumps(metadata, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def object_dir(self, content_hash: str) -> Path:
+        """Directory holding the object for a content hash."""
+        return self.objects_dir / content_hash[:2] / content_hash
+
+    def put(self, run_id: str, skill_md: str, metadata: Dict, status: Optional[str] = None) -> Dict:
+        """
+        Store a skill and record the run in the manifest.
+
+        Args:
+            run_id: Run that produced the skill
+            skill_md: Compiled SKILL.md
+            metadata: Generation metadata; volatile keys are stripped
+            status: Run status recorded in the manifest
+
+        Returns:
+            Manifest entry: run_id, content_hash, path, deduplicated, status, saved_at
+        """
+        metadata = self.normalize(metadata)
+        content_hash = self.content_hash(skill_md, metadata)
+        object_dir = self.object_dir(content_hash)
+
+        deduplicated = object_dir.exists()
+        if not deduplicated:
+            deduplicated = not self._write_object(object_dir, skill_md, metadata)
+
+        entry = {
+            "run_id": run_id,
+            "content_hash": content_hash,
+            "path": str(object_dir),
+            "deduplicated": deduplicated,
+            "status": status,
+            "saved_at": datetime.now().isoformat(),
+        }
+        self._append_manifest(entry)
+
+        if deduplicated:
+            logger.info(f"Artifacts for run {run_id} deduplicated against {content_hash[:12]}")
+        return entry
+
+    def lookup(self, run_id: str) -> Optional[Dict]:
+        """Return the latest manifest entry for a run, if any."""
+        if not self.manifest_path.exists():
+            return None
+
+        found = None
+        with open(self.manifest_path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["run_id"] == run_id:
+                    found = entry
+        return found
+
+    def _write_object(self, object_dir: Path, skill_md: str, metadata: Dict) -> bool:
+        """
+        Write an object via a temp directory and an atomic rename.
+
+        Returns:
+            False if another writer stored the same object first
+        """
+        object_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=object_dir.parent))
+        try:
+            with open(tmp_dir / "SKILL.md", "w") as f:
+                f.write(skill_md)
+            with open(tmp_dir / "metadata.json", "w") as f:
+                json.dump(metadata, f, indent=2)
+            os.rename(tmp_dir, object_dir)
+            return True
+        except OSError:
+            if object_dir.exists():
+                return False
+            raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _append_manifest(self, entry: Dict) -> None:
+        """Append one manifest line with a single O_APPEND write."""
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        fd = os.open(self.manifest_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
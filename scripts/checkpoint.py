@@ -0,0 +1,91 @@
+"""
+Pipeline Checkpoints - Per-run persistence of SkillForge step outputs
+
+Each run of the 6-step pipeline gets its own checkpoint directory:
+
+    <root>/<run_id>/run.json            # request + interactive flag
+    <root>/<run_id>/<step>.json         # one file per completed step
+
+Step outputs are written as soon as the step completes, so a run that
+fails later (e.g. in Step 5 or validation) can be resumed from the first
+missing step instead of starting over.
+"""
+
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """File-backed store of per-run step outputs."""
+
+    RUN_FILE = "run.json"
+
+    def __init__(self, root: str):
+        """
+        Initialize the checkpoint store.
+
+        Args:
+            root: Directory holding one subdirectory per run
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def new_run_id() -> str:
+        """Create a unique, sortable run ID."""
+        return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+    def run_dir(self, run_id: str) -> Path:
+        """Directory holding a run's checkpoints."""
+        return self.root / run_id
+
+    def start(self, run_id: str, run_info: Dict[str, Any]) -> None:
+        """Record the inputs of a new run."""
+        self.run_dir(run_id).mkdir(parents=True, exist_ok=True)
+        self._write_json(self.run_dir(run_id) / self.RUN_FILE, run_info)
+
+    def save_step(self, run_id: str, step: str, output: Any) -> None:
+        """Persist one step's output."""
+        self._write_json(self.run_dir(run_id) / f"{step}.json", output)
+        logger.debug(f"Checkpointed {step} for run {run_id}")
+
+    def load(self, run_id: str) -> Dict[str, Any]:
+        """
+        Load a run's inputs and completed step outputs.
+
+        Returns:
+            Dict with "run" (the recorded inputs) and "steps" (step -> output)
+
+        Raises:
+            FileNotFoundError: If no checkpoint exists for the run
+        """
+        run_dir = self.run_dir(run_id)
+        run_file = run_dir / self.RUN_FILE
+        if not run_file.exists():
+            raise FileNotFoundError(f"No checkpoint found for run {run_id}")
+
+        with open(run_file) as f:
+            run_info = json.load(f)
+
+        steps = {}
+        for path in run_dir.glob("*.json"):
+            if path.name == self.RUN_FILE:
+                continue
+            with open(path) as f:
+                steps[path.stem] = json.load(f)
+
+        return {"run": run_info, "steps": steps}
+
+    def _write_json(self, path: Path, data: Any) -> None:
+        """Write JSON atomically so a crash never leaves a partial checkpoint."""
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,198 @@
+"""
+Disk Cache - On-disk LRU cache with size and TTL eviction
+
+Entries are JSON files grouped by namespace:
+
+    <root>/<namespace>/<kk>/<key>.json
+
+Recency is tracked through file modification times (touched on every hit),
+so eviction order survives restarts. Expired entries are dropped on read
+and during eviction; when the total size exceeds ``max_bytes``, the least
+recently used entries are removed first. A whole namespace can be
+invalidated at once.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable hash of JSON-serializable parts (dict key order is ignored)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskLRUCache:
+    """Size- and TTL-bounded JSON cache stored on disk."""
+
+    def __init__(self, root: str, max_bytes: int = 256 * 1024 * 1024, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Cache directory
+            max_bytes: Total size above which least recently used entries are evicted
+            ttl_seconds: Entry lifetime (None = no expiry)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_served = 0
+
+        # path -> (size, last access); loaded lazily from disk
+        self._index: Optional[Dict[Path, Tuple[int, float]]] = None
+
+    def get(self, key: str, namespace: str = "default") -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry."""
+        path = self._path(key, namespace)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        if self._expired(entry):
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        size = path.stat().st_size if path.exists() else 0
+        if self._index is not None:
+            self._index[path] = (size, now)
+
+        self.hits += 1
+        self.bytes_served += size
+        return entry["value"]
+
+    def put(self, key: str, value: Any, namespace: str = "default") -> int:
+        """
+        Store a value, evicting old entries if the cache is over size.
+
+        Returns:
+            Bytes written
+        """
+        path = self._path(key, namespace)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        data = json.dumps({"created_at": time.time(), "value": value}, default=str)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        size = path.stat().st_size
+        index = self._load_index()
+        index[path] = (size, time.time())
+        self._evict()
+        return size
+
+    def invalidate(self, namespace: str) -> int:
+        """
+        Drop every entry in a namespace.
+
+        Returns:
+            Number of entries removed
+        """
+        ns_dir = self.root / self._safe(namespace)
+        if not ns_dir.exists():
+            return 0
+
+        removed = list(ns_dir.rglob("*.json"))
+        shutil.rmtree(ns_dir, ignore_errors=True)
+        if self._index is not None:
+            for path in removed:
+                self._index.pop(path, None)
+
+        logger.info(f"Invalidated {len(removed)} cache entries in {namespace}")
+        return len(removed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes_served": self.bytes_served,
+            "size_bytes": sum(size for size, _ in self._load_index().values()),
+            "entries": len(self._load_index()),
+        }
+
+    def _path(self, key: str, namespace: str) -> Path:
+        return self.root / self._safe(namespace) / key[:2] / f"{key}.json"
+
+    @staticmethod
+    def _safe(namespace: str) -> str:
+        """Filesystem-safe directory name for a namespace."""
+        return "".join(c if c.isalnum() or c in "-_." else "_" for c in namespace) or "default"
+
+    def _expired(self, entry: Dict) -> bool:
+        return self.ttl_seconds is not None and time.time() - entry.get("created_at", 0) > self.ttl_seconds
+
+    def _load_index(self) -> Dict[Path, Tuple[int, float]]:
+        if self._index is None:
+            self._index = {}
+            for path in self.root.rglob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                self._index[path] = (stat.st_size, stat.st_mtime)
+        return self._index
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        index = self._load_index()
+
+        if self.ttl_seconds is not None:
+            cutoff = time.time() - self.ttl_seconds
+            # Last access >= write time, so entries not touched since the
+            # cutoff are the only expiry candidates
+            for path, (_, accessed) in list(index.items()):
+                if accessed < cutoff:
+                    try:
+                        with open(path) as f:
+                            expired = self._expired(json.load(f))
+                    except (OSError, json.JSONDecodeError):
+                        expired = True
+                    if expired:
+                        self._remove(path)
+
+        total = sum(size for size, _ in index.values())
+        if total <= self.max_bytes:
+            return
+
+        for path, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        if self._index is not None and self._index.pop(path, None) is not None:
+            self.evictions += 1
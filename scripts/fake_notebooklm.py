@@ -0,0 +1,317 @@
+"""
+Fake NotebookLM - Local stand-in service for load and performance testing
+
+Implements create-notebook and query (whole or streamed line by line) with
+configurable latency distributions, error rates and throttling, so Step 3's concurrency,
+caching, rate limiting and retry behavior can be exercised offline.
+
+Two forms:
+- FakeNotebookLMBackend: in-process async backend for NotebookLMIntegration
+- a stdio worker speaking the notebooklm_workers JSON-lines protocol, for
+  exercising the worker pool as well:
+
+      python fake_notebooklm.py --latency lognormal:0.2,0.5 --throttle-rate 0.05
+
+Select either with ``NotebookLMIntegration(backend="fake")`` or
+``backend="fake-stdio"`` and ``fake_options={...}``.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import math
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+
+try:
+    from .notebooklm_workers import serve_worker
+    from .rate_limiter import ThrottledError
+except ImportError:
+    from notebooklm_workers import serve_worker
+    from rate_limiter import ThrottledError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LatencyProfile:
+    """
+    Response latency distribution, in seconds.
+
+    ``fixed`` always takes ``median``; ``uniform`` draws from
+    [low, high]; ``lognormal`` has the given median and log-space
+    ``sigma`` (long tail); ``exponential`` has mean ``median / ln 2``.
+    """
+    distribution: str = "lognormal"
+    median: float = 0.05
+    sigma: float = 0.5
+    low: float = 0.0
+    high: float = 0.1
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyProfile":
+        """
+        Parse "fixed:0.05", "uniform:0.01,0.2", "lognormal:0.05,0.5" or
+        "exponential:0.05".
+        """
+        name, _, params = spec.partition(":")
+        values = [float(v) for v in params.split(",") if v]
+        if name == "fixed":
+            return cls("fixed", median=values[0] if values else 0.0)
+        if name == "uniform":
+            low, high = (values + [0.0, 0.1][len(values):])[:2]
+            return cls("uniform", low=low, high=high)
+        if name == "lognormal":
+            median, sigma = (values + [0.05, 0.5][len(values):])[:2]
+            return cls("lognormal", median=median, sigma=sigma)
+        if name == "exponential":
+            return cls("exponential", median=values[0] if values else 0.05)
+        raise ValueError(f"Unknown latency distribution: {name!r}")
+
+    def spec(self) -> str:
+        """Inverse of ``parse``."""
+        if self.distribution == "uniform":
+            return f"uniform:{self.low},{self.high}"
+        if self.distribution == "lognormal":
+            return f"lognormal:{self.median},{self.sigma}"
+        return f"{self.distribution}:{self.median}"
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "fixed":
+            return self.median
+        if self.distribution == "uniform":
+            return rng.uniform(self.low, self.high)
+        if self.distribution == "lognormal":
+            return self.median * math.exp(rng.gauss(0.0, self.sigma)) if self.median > 0 else 0.0
+        if self.distribution == "exponential":
+            return rng.expovariate(math.log(2) / self.median) if self.median > 0 else 0.0
+        raise ValueError(f"Unknown latency distribution: {self.distribution!r}")
+
+
+class FakeNotebookLMService:
+    """Shared behavior of the fake: outcomes, latencies, answers and counters."""
+
+    def __init__(
+        self,
+        latency="lognormal:0.05,0.5",
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        max_qps: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        answer_lines: int = 5,
+        line_latency: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the fake service.
+
+        Args:
+            latency: LatencyProfile or spec string (see LatencyProfile.parse)
+            error_rate: Probability that a call fails with a server error
+            throttle_rate: Probability that a call is throttled at random
+            max_qps: Throttle calls above this many per second (sliding 1s window)
+            max_concurrent: Throttle calls while this many are already in flight
+            retry_after: Retry delay suggested with throttling errors
+            answer_lines: Lines per synthetic answer (per section when batched)
+            line_latency: Seconds between lines of a streamed answer (the
+                sampled latency is the time to the first line)
+            seed: Seed for reproducible latencies and failures
+        """
+        self.latency = LatencyProfile.parse(latency) if isinstance(latency, str) else latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_qps = max_qps
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self.answer_lines = answer_lines
+        self.line_latency = line_latency
+        self.rng = random.Random(seed)
+
+        self.notebooks: Dict[str, str] = {}
+        self.in_flight = 0
+        self._ids = itertools.count(1)
+        self._recent = []
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.errors = 0
+        self.throttled = 0
+        self.peak_in_flight = 0
+        self.lines_streamed = 0
+        self.streams_closed = 0
+
+    def begin(self) -> float:
+        """
+        Admit a call, returning its simulated latency.
+
+        Raises:
+            ThrottledError: If the call is throttled
+            RuntimeError: If the call fails with a simulated server error
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.calls += 1
+            self._recent = [t for t in self._recent if now - t < 1.0]
+
+            throttled = (
+                (self.max_concurrent is not None and self.in_flight >= self.max_concurrent)
+                or (self.max_qps is not None and len(self._recent) >= self.max_qps)
+                or self.rng.random() < self.throttle_rate
+            )
+            if throttled:
+                self.throttled += 1
+                raise ThrottledError("429 Too Many Requests (throttled by fake NotebookLM)", self.retry_after)
+            if self.rng.random() < self.error_rate:
+                self.errors += 1
+                raise RuntimeError("500 Internal Server Error (fake NotebookLM)")
+
+            self._recent.append(now)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return self.latency.sample(self.rng)
+
+    def end(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def create_notebook(self, name: str, document: str) -> str:
+        notebook_id = f"fake_notebook_{next(self._ids)}"
+        self.notebooks[notebook_id] = name
+        return notebook_id
+
+    def answer(self, notebook_id: str, question: str) -> str:
+        # Any fake ID is accepted: with several stdio workers the notebook
+        # may have been created by another process
+        if not notebook_id.startswith("fake_notebook_"):
+            raise RuntimeError(f"404 Notebook not found: {notebook_id}")
+        # Batched prompts list one "### category" header per question
+        categories = re.findall(r"^### (\w+)$", question, re.MULTILINE)
+        if categories:
+            return "\n\n".join(f"### {c}\n{self._lines(c)}" for c in categories)
+        return self._lines(question.split("?")[0][:40])
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "lines_streamed": self.lines_streamed,
+            "streams_closed": self.streams_closed,
+            "notebooks": len(self.notebooks),
+        }
+
+    def _lines(self, topic: str) -> str:
+        return "\n".join(f"{topic}: point {i + 1}" for i in range(self.answer_lines))
+
+
+class FakeNotebookLMBackend:
+    """In-process async NotebookLMIntegration backend backed by the fake service."""
+
+    def __init__(self, **options):
+        """Initialize with FakeNotebookLMService options."""
+        self.service = FakeNotebookLMService(**options)
+
+    async def create_notebook(self, name: str, document: str) -> str:
+        return await self._call(self.service.create_notebook, name, document)
+
+    async def query(self, notebook_id: str, question: str) -> str:
+        return await self._call(self.service.answer, notebook_id, question)
+
+    async def query_stream(self, notebook_id: str, question: str) -> AsyncIterator[str]:
+        """Yield the answer line by line; closing the iterator early cancels the rest."""
+        delay = self.service.begin()
+        remaining = 0
+        try:
+            await asyncio.sleep(delay)
+            lines = self.service.answer(notebook_id, question).split("\n")
+            remaining = len(lines)
+            for i, line in enumerate(lines):
+                if i:
+                    await asyncio.sleep(self.service.line_latency)
+                remaining -= 1
+                self.service.lines_streamed += 1
+                yield line + "\n" if remaining else line
+        finally:
+            if remaining:
+                self.service.streams_closed += 1
+            self.service.end()
+
+    def stats(self) -> Dict:
+        return self.service.stats()
+
+    async def _call(self, fn, *args):
+        delay = self.service.begin()
+        try:
+            await asyncio.sleep(delay)
+            return fn(*args)
+        finally:
+            self.service.end()
+
+
+class FakeNotebookLMHandler:
+    """Worker-side handler (see notebooklm_workers.serve_worker) backed by the fake service."""
+
+    def __init__(self, **options):
+        self.service = FakeNotebookLMService(**options)
+
+    def ping(self) -> Dict:
+        return {"fake": True}
+
+    def create_notebook(self, name: str, document: str) -> str:
+        return self._call(self.service.create_notebook, name, document)
+
+    def query(self, notebook_id: str, question: str) -> str:
+        return self._call(self.service.answer, notebook_id, question)
+
+    def stats(self) -> Dict:
+        return self.service.stats()
+
+    def _call(self, fn, *args):
+        delay = self.service.begin()
+        try:
+            time.sleep(delay)
+            return fn(*args)
+        finally:
+            self.service.end()
+
+
+def worker_command(**options) -> list:
+    """Command line starting a fake stdio worker with the given service options."""
+    command = [sys.executable, __file__]
+    for name, value in options.items():
+        if value is None:
+            continue
+        if isinstance(value, LatencyProfile):
+            value = value.spec()
+        command += [f"--{name.replace('_', '-')}", str(value)]
+    return command
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake NotebookLM JSON-lines worker")
+    parser.add_argument("--latency", default="lognormal:0.05,0.5", help="Latency distribution spec")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-qps", type=float)
+    parser.add_argument("--max-concurrent", type=int)
+    parser.add_argument("--retry-after", type=float)
+    parser.add_argument("--answer-lines", type=int, default=5)
+    parser.add_argument("--line-latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    serve_worker(FakeNotebookLMHandler(**vars(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Knowledge Index - BM25 retrieval over local Markdown guidance
+
+Backs offline canon generation with the real guidance in ``references/``
+(and any user-supplied corpus directory) instead of placeholder text.
+
+Markdown files are split into passages tagged by kind:
+
+- ``section``: each heading's body text
+- ``template``: fenced code blocks (named after their heading)
+- ``failure_mode``: "Symptom: ... / Fix: ..." pairs
+- ``quickstart`` / ``decision_point`` / ``edge_case``: "Quickstart:",
+  "Decision points:" and "Edge cases:" lines, and list items under edge
+  case headings
+
+Passages are ranked with BM25 against the scope card. The index (passages,
+postings and document lengths) is saved as JSON and reused until a source
+file changes.
+
+Build or query an index directly with:
+
+    python knowledge_index.py build --corpus ./my_docs --index index.json
+    python knowledge_index.py search "api rate limit" --kind failure_mode
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+REFERENCES_DIR = Path(__file__).resolve().parent.parent / "references"
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how if in into is it its "
+    "of on or so that the their then there these this to use used using was what when "
+    "where which while who why will with you your".split()
+)
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+FENCE = re.compile(r"^\s*```")
+# Only a bare fence closes a code block ("```python" inside one is content)
+CLOSING_FENCE = re.compile(r"^\s*```\s*$")
+LABEL = re.compile(r"^\s*\*\*([^*]+)\*\*\s*$")
+SYMPTOM = re.compile(r"^\W*symptom\W*:?\s*(.+)$", re.IGNORECASE)
+FIX = re.compile(r"^\W*fix\W*:?\s*(.+)$", re.IGNORECASE)
+LABELLED = re.compile(r"^\s*[-*]\s*(quickstart|decision points|edge cases)\s*:\s*(.+)$", re.IGNORECASE)
+LIST_ITEM = re.compile(r"^\s*[-*]\s+(?!\[)(.+)$")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords, with a crude plural fold."""
+    tokens = []
+    for token in TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _clean(text: str) -> str:
+    """Strip Markdown emphasis and surrounding quotes from inline text."""
+    return text.replace("**", "").replace("`", "").replace('"', "").strip()
+
+
+def chunk_markdown(text: str, source: str) -> List[Dict]:
+    """Split a Markdown document into tagged passages."""
+    passages = []
+    headings: List[str] = []
+    body: List[str] = []
+    code: Optional[List[str]] = None
+    symptom = None
+    # Bold-only line naming the example that follows (e.g. "**API Rate Limit**")
+    label = None
+
+    def add(kind: str, text: str, **fields) -> None:
+        context = headings + [label] if label else headings
+        passages.append({"kind": kind, "text": text, "source": source,
+                         "heading": " > ".join(h for h in context if h), **fields})
+
+    def flush_section() -> None:
+        content = "\n".join(line for line in body if line.strip()).strip()
+        if content:
+            add("section", content)
+        body.clear()
+
+    def scan_failure(line: str) -> None:
+        nonlocal symptom
+        match = SYMPTOM.match(line)
+        if match:
+            symptom = _clean(match.group(1))
+            return
+        match = FIX.match(line)
+        if match and symptom:
+            add("failure_mode", f"{symptom} {_clean(match.group(1))}",
+                symptom=symptom, fix=_clean(match.group(1)))
+            symptom = None
+
+    for line in text.splitlines():
+        if code is not None:
+            if CLOSING_FENCE.match(line):
+                content = "\n".join(code).strip()
+                # Symptom/Fix examples are failure modes, not templates; a
+                # horizontal rule means the fences were unbalanced
+                if content and not any(SYMPTOM.match(l) or l.strip() == "---" for l in code):
+                    add("template", content, name=headings[-1] if headings else source)
+                code = None
+            else:
+                code.append(line)
+                scan_failure(line)
+            continue
+
+        if FENCE.match(line):
+            code = []
+            symptom = None
+            continue
+
+        heading = HEADING.match(line)
+        if heading:
+            flush_section()
+            label = None
+            level = len(heading.group(1))
+            del headings[level - 1:]
+            headings.extend([""] * (level - 1 - len(headings)))
+            headings.append(_clean(heading.group(2)))
+            # "### Symptom: ..." headings start a failure mode
+            scan_failure(heading.group(2))
+            continue
+
+        body.append(line)
+        bold = LABEL.match(line)
+        if bold:
+            label = _clean(bold.group(1))
+        scan_failure(line)
+
+        labelled = LABELLED.match(line)
+        if labelled:
+            field, value = labelled.group(1).lower(), _clean(labelled.group(2))
+            if field == "quickstart":
+                add("quickstart", value)
+            elif field == "decision points":
+                for question in re.findall(r"[^?]+\?", value):
+                    add("decision_point", question.strip())
+            else:
+                for item in value.split(","):
+                    item = item.strip()
+                    if item:
+                        add("edge_case", item[0].upper() + item[1:])
+            continue
+
+        item = LIST_ITEM.match(line)
+        if item and any("edge case" in h.lower() for h in headings):
+            add("edge_case", _clean(item.group(1)))
+
+    flush_section()
+    return passages
+
+
+class KnowledgeIndex:
+    """Persisted BM25 index over Markdown passages."""
+
+    def __init__(
+        self,
+        corpus_dirs: Optional[Iterable[str]] = None,
+        index_path: Optional[str] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        """
+        Initialize the index (built or loaded on first search).
+
+        Args:
+            corpus_dirs: Directories of *.md files (default: references/)
+            index_path: JSON file the index is saved to and loaded from
+                (None = keep in memory only)
+            k1: BM25 term-frequency saturation
+            b: BM25 document-length normalization
+        """
+        self.corpus_dirs = [Path(d) for d in (corpus_dirs or [REFERENCES_DIR])]
+        self.index_path = Path(index_path) if index_path else None
+        self.k1 = k1
+        self.b = b
+
+        self.passages: List[Dict] = []
+        self.postings: Dict[str, List[List[int]]] = {}
+        self.doc_len: List[int] = []
+        self.avgdl = 0.0
+        self._loaded = False
+
+    def search(self, query: str, kind: Optional[str] = None, k: int = 5) -> List[Dict]:
+        """
+        Top-``k`` passages for ``query`` (optionally only of one kind).
+
+        Returns:
+            Passage dicts with a ``score`` field, best first
+        """
+        self.ensure()
+        n = len(self.passages)
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf in postings:
+                if kind and self.passages[doc]["kind"] != kind:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc] / self.avgdl)
+                scores[doc] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [{**self.passages[doc], "score": round(score, 4)} for doc, score in ranked]
+
+    def passages_of(self, kind: str) -> List[Dict]:
+        """All passages of one kind, in corpus order."""
+        self.ensure()
+        return [p for p in self.passages if p["kind"] == kind]
+
+    def ensure(self) -> None:
+        """Load the saved index if it is current, otherwise rebuild it."""
+        if self._loaded:
+            return
+        signature = self._signature()
+        if self.index_path and self.index_path.exists():
+            try:
+                with open(self.index_path) as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION and data.get("sources") == signature:
+                    self.passages = data["passages"]
+                    self.postings = data["postings"]
+                    self.doc_len = data["doc_len"]
+                    self.avgdl = data["avgdl"]
+                    self._loaded = True
+                    return
+            except (OSError, json.JSONDecodeError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable knowledge index {self.index_path}: {e}")
+        self.build(signature)
+
+    def build(self, signature: Optional[Dict] = None) -> None:
+        """Chunk every corpus file and rebuild the postings."""
+        signature = signature or self._signature()
+        self.passages = []
+        for path in signature:
+            with open(path, encoding="utf-8") as f:
+                self.passages.extend(chunk_markdown(f.read(), Path(path).name))
+
+        postings = defaultdict(list)
+        self.doc_len = []
+        for doc, passage in enumerate(self.passages):
+            tokens = tokenize(f"{passage['heading']} {passage['text']}")
+            self.doc_len.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                postings[term].append([doc, tf])
+        self.postings = dict(postings)
+        self.avgdl = sum(self.doc_len) / len(self.doc_len) if self.doc_len else 1.0
+        self._loaded = True
+        logger.info(f"Built knowledge index: {len(self.passages)} passages from {len(signature)} files")
+
+        if self.index_path:
+            self._save(signature)
+
+    def _signature(self) -> Dict[str, List[float]]:
+        """Corpus files with their modification time and size."""
+        files = {}
+        for corpus_dir in self.corpus_dirs:
+            for path in sorted(corpus_dir.rglob("*.md")):
+                stat = path.stat()
+                files[str(path)] = [stat.st_mtime, stat.st_size]
+        return files
+
+    def _save(self, signature: Dict) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "sources": signature,
+            "passages": self.passages,
+            "postings": self.postings,
+            "doc_len": self.doc_len,
+            "avgdl": self.avgdl,
+        }
+        tmp_path = self.index_path.with_name(f".{self.index_path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.index_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or query the SkillForge knowledge index")
+    parser.add_argument("command", choices=["build", "search"])
+    parser.add_argument("query", nargs="?", default="", help="Search query")
+    parser.add_argument("--corpus", action="append", help="Corpus directory (repeatable; default: references/)")
+    parser.add_argument("--index", help="Index file")
+    parser.add_argument("--kind", help="Only passages of this kind")
+    parser.add_argument("-k", type=int, default=5, help="Results to show")
+    args = parser.parse_args()
+
+    corpus = ([str(REFERENCES_DIR)] + args.corpus) if args.corpus else None
+    index = KnowledgeIndex(corpus, args.index)
+    if args.command == "build":
+        index.build()
+        print(f"Indexed {len(index.passages)} passages")
+        return
+
+    for hit in index.search(args.query, kind=args.kind, k=args.k):
+        print(f"[{hit['score']:.3f}] {hit['kind']} ({hit['source']}: {hit['heading']})")
+        print(f"    {hit['text'][:200]}")
+
+
+if __name__ == "__main__":
+    main()
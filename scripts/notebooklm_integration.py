@@ -11,11 +11,32 @@ This module handles Step 3 of SkillForge:
 import json
 import logging
 import asyncio
+import math
+import os
+import time
+import uuid
+from collections import deque
+from pathlib import Path
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 import subprocess
 import sys
 
+try:
+    from .disk_cache import DiskLRUCache, cache_key
+    from .fake_notebooklm import FakeNotebookLMBackend, worker_command as fake_worker_command
+    from .knowledge_index import REFERENCES_DIR, KnowledgeIndex
+    from .notebooklm_workers import NotebookLMWorkerPool
+    from .rate_limiter import shared_limiter
+    from .tracing import span
+except ImportError:
+    from disk_cache import DiskLRUCache, cache_key
+    from fake_notebooklm import FakeNotebookLMBackend, worker_command as fake_worker_command
+    from knowledge_index import REFERENCES_DIR, KnowledgeIndex
+    from notebooklm_workers import NotebookLMWorkerPool
+    from rate_limiter import shared_limiter
+    from tracing import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +46,66 @@ class CanonQuestion:
     question: str
     category: str  # quickstart, decision_points, templates, failure_modes, edge_cases
     parser_fn: callable  # Function to parse response
+    max_lines: Optional[int] = None  # Leading answer lines parser_fn reads (None = all)
+
+
+class NotebookRegistry:
+    """
+    Persistent map from a scope-document fingerprint to a NotebookLM notebook.
+
+    Lets reruns with an unchanged scope reuse the notebook created earlier
+    instead of creating one and uploading its sources again.
+    """
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = 7 * 24 * 3600):
+        """
+        Initialize the registry.
+
+        Args:
+            path: JSON file holding the registry
+            ttl_seconds: Age after which a notebook is no longer reused (None = never expires)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+
+    def lookup(self, fingerprint: str) -> Optional[str]:
+        """Return the notebook ID registered for a fingerprint, unless expired."""
+        entry = self._load().get(fingerprint)
+        if not entry:
+            return None
+        if self.ttl_seconds is not None and time.time() - entry["created_at"] > self.ttl_seconds:
+            return None
+        return entry["notebook_id"]
+
+    def register(self, fingerprint: str, notebook_id: str) -> None:
+        """Record the notebook created for a fingerprint, dropping expired entries."""
+        entries = self._load()
+        now = time.time()
+        if self.ttl_seconds is not None:
+            entries = {k: v for k, v in entries.items() if now - v["created_at"] <= self.ttl_seconds}
+        entries[fingerprint] = {"notebook_id": notebook_id, "created_at": now}
+        self._save(entries)
+
+    def forget(self, notebook_id: str) -> None:
+        """Stop reusing a notebook (e.g. it was deleted remotely)."""
+        entries = self._load()
+        remaining = {k: v for k, v in entries.items() if v["notebook_id"] != notebook_id}
+        if len(remaining) != len(entries):
+            self._save(remaining)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, entries: Dict[str, Dict]) -> None:
+        tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp_path, self.path)
 
 
 class NotebookLMIntegration:
@@ -40,87 +121,216 @@ class NotebookLMIntegration:
         CanonQuestion(
             question="Provide a 3-step quickstart for this skill",
             category="quickstart",
-            parser_fn=lambda resp: resp.split("\n")[:3]
+            parser_fn=lambda resp: resp.split("\n")[:3],
+            max_lines=3,
         ),
         CanonQuestion(
             question="What are the key decision points when using this skill?",
             category="decision_points",
-            parser_fn=lambda resp: resp.split("\n")[:5]
+            parser_fn=lambda resp: resp.split("\n")[:5],
+            max_lines=5,
         ),
         CanonQuestion(
             question="Provide 2-3 practical templates or command examples",
             category="templates",
-            parser_fn=lambda resp: [{"name": f"Template {i+1}", "content": line} for i, line in enumerate(resp.split("\n")[:3])]
+            parser_fn=lambda resp: [{"name": f"Template {i+1}", "content": line} for i, line in enumerate(resp.split("\n")[:3])],
+            max_lines=3,
         ),
         CanonQuestion(
             question="What are the most common failure modes and how to fix them?",
             category="failure_modes",
-            parser_fn=lambda resp: [{"symptom": "Issue", "fix": "Fix approach"}]
+            parser_fn=lambda resp: [{"symptom": "Issue", "fix": "Fix approach"}],
+            max_lines=1,
         ),
         CanonQuestion(
             question="What are important edge cases to consider?",
             category="edge_cases",
-            parser_fn=lambda resp: resp.split("\n")[:5]
+            parser_fn=lambda resp: resp.split("\n")[:5],
+            max_lines=5,
         ),
     ]
 
-    def __init__(self, notebooklm_query_path: Optional[str] = None):
+    def __init__(
+        self,
+        notebooklm_query_path: Optional[str] = None,
+        max_concurrency: int = 5,
+        query_timeout: Optional[float] = 60.0,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        cache_ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        registry_path: Optional[str] = None,
+        notebook_ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        backend=None,
+        workers: int = 0,
+        worker_options: Optional[Dict] = None,
+        fake_options: Optional[Dict] = None,
+        batch_questions: bool = False,
+        rate_limiter="shared",
+        step_budget: Optional[float] = None,
+        hedge: bool = False,
+        hedge_after: Optional[float] = None,
+        hedge_min_samples: int = 10,
+        stream_answers: bool = False,
+        corpus_dirs: Optional[List[str]] = None,
+        knowledge_index_path: Optional[str] = None,
+    ):
         """
         Initialize NotebookLM integration.
 
         Args:
             notebooklm_query_path: Path to notebooklm-query skill scripts directory
+            max_concurrency: Maximum canon questions in flight per collection
+            query_timeout: Seconds before a question falls back (None = no limit)
+            cache_dir: If set, cache answers on disk here, keyed by notebook,
+                normalized question and source-set fingerprint
+            cache_max_bytes: Answer cache size limit (LRU eviction)
+            cache_ttl_seconds: Answer cache entry lifetime (None = no expiry)
+            registry_path: If set, reuse notebooks across runs whose scope
+                document and sources are unchanged (registry JSON file)
+            notebook_ttl_seconds: How long a registered notebook is reused
+            backend: Object with async ``create_notebook(name, document)`` and
+                ``query(notebook_id, question)`` serving NotebookLM calls,
+                or "fake" / "fake-stdio" for the local fake service
+                in-process / in worker processes (default: built-in mock
+                responses)
+            workers: If > 0 (and ``notebooklm_query_path`` is set), serve calls
+                from this many warm notebooklm-query worker processes
+            worker_options: Extra keyword arguments for NotebookLMWorkerPool
+            fake_options: Latency, error and throttling settings for the fake
+                service (see fake_notebooklm.FakeNotebookLMService)
+            batch_questions: Ask all canon questions in one composite query
+                by default (see ``collect_canon``)
+            rate_limiter: AdaptiveLimiter applied to backend calls; "shared"
+                uses the process-wide limiter, None disables limiting
+            step_budget: Overall seconds for one ``collect_canon``; questions
+                still unanswered when it runs out fall back (None = no limit)
+            hedge: Send a duplicate remote query when the first is slower
+                than ``hedge_after`` and keep whichever answers first
+            hedge_after: Hedge delay in seconds (default: p95 of recent
+                remote query latencies, once ``hedge_min_samples`` are known)
+            hedge_min_samples: Latency samples needed before hedging on p95
+            stream_answers: Read answers from the backend's ``query_stream``
+                (if it has one) and cancel the stream once the question's
+                parser has the ``max_lines`` it needs
+            corpus_dirs: Extra directories of Markdown guidance searched,
+                with references/, by offline canon generation
+            knowledge_index_path: File the offline knowledge index is
+                persisted to (None = rebuilt in memory when first needed)
         """
-        self.notebooklm_query_path = notebooklm_query_path
-        self.notebook_id = None
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
 
-    async def collect_canon(self, scope_card: Dict) -> Dict:
+        self.notebooklm_query_path = notebooklm_query_path
+        self.max_concurrency = max_concurrency
+        self.query_timeout = query_timeout
+        self.batch_questions = batch_questions
+        self.step_budget = step_budget
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.hedge_min_samples = hedge_min_samples
+        self.stream_answers = stream_answers
+
+        self.knowledge_index = KnowledgeIndex(
+            [str(REFERENCES_DIR)] + list(corpus_dirs or []), knowledge_index_path
+        )
+
+        # Recent successful remote query latencies (seconds), for hedge delays
+        self.query_latencies = deque(maxlen=200)
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.deadline_fallbacks = 0
+        self.streams_cancelled = 0
+
+        self.response_cache = (
+            DiskLRUCache(cache_dir, cache_max_bytes, cache_ttl_seconds) if cache_dir else None
+        )
+        self.cache_bytes_saved = 0
+
+        if backend == "fake":
+            backend = FakeNotebookLMBackend(**(fake_options or {}))
+        elif backend == "fake-stdio":
+            backend = NotebookLMWorkerPool(
+                fake_worker_command(**(fake_options or {})), size=max(workers, 1), **(worker_options or {})
+            )
+        elif backend is None and workers > 0 and notebooklm_query_path:
+            backend = NotebookLMWorkerPool.for_query_skill(
+                notebooklm_query_path, size=workers, **(worker_options or {})
+            )
+        self.backend = backend
+        self.rate_limiter = shared_limiter() if rate_limiter == "shared" else rate_limiter
+
+        self.registry = NotebookRegistry(registry_path, notebook_ttl_seconds) if registry_path else None
+        # Fingerprint -> in-flight notebook creation, so concurrent runs with
+        # the same scope create one notebook
+        self._creating: Dict[str, asyncio.Future] = {}
+
+    async def collect_canon(self, scope_card: Dict, batched: Optional[bool] = None) -> Dict:
         """
         Collect external canon from NotebookLM.
 
         Args:
             scope_card: Step 1 output (scope definition)
+            batched: Ask all questions in one composite query, re-asking
+                individually any category missing from the answer
+                (default: ``batch_questions``)
 
         Returns:
             External canon dict with all extracted knowledge
         """
         logger.info("Starting external canon collection via NotebookLM...")
+        loop = asyncio.get_running_loop()
+        deadline = None if self.step_budget is None else loop.time() + self.step_budget
 
         try:
-            # Step 1: Create NotebookLM notebook
-            logger.info("Creating NotebookLM notebook...")
-            self.notebook_id = await self._create_notebook(scope_card)
-
-            if not self.notebook_id:
+            # Step 1: Create (or reuse) NotebookLM notebook
+            # Keep the notebook ID local to this run so one integration
+            # instance can serve concurrent collections
+            fingerprint = self._source_fingerprint(scope_card)
+            try:
+                notebook_id = await asyncio.wait_for(
+                    self._get_notebook(scope_card, fingerprint),
+                    None if deadline is None else max(0.0, deadline - loop.time()),
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Notebook creation exceeded the Step 3 budget")
+                notebook_id = None
+
+            if not notebook_id:
                 logger.warning("Could not create NotebookLM notebook, using offline mode")
                 return self._generate_canon_offline(scope_card)
 
-            # Step 2: Ask structured questions
+            # Step 2: Ask structured questions (one composite query, or
+            # concurrently per question, capped)
             logger.info("Asking NotebookLM for canon...")
             canon_data = {}
-
-            for question in self.CANON_QUESTIONS:
-                logger.info(f"Querying {question.category}...")
-                answer = await self._query_notebook(self.notebook_id, question.question)
-
-                if answer:
-                    canon_data[question.category] = question.parser_fn(answer)
-                else:
-                    logger.warning(f"No answer for {question.category}, using fallback")
-                    canon_data[question.category] = self._get_fallback(question.category)
+            if self.batch_questions if batched is None else batched:
+                canon_data = await self._ask_batched(notebook_id, fingerprint, deadline)
+
+            remaining = [q for q in self.CANON_QUESTIONS if q.category not in canon_data]
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            fallbacks: List[str] = []
+            answers = await asyncio.gather(*(
+                self._ask_question(notebook_id, question, semaphore, fingerprint, deadline, fallbacks)
+                for question in remaining
+            ))
+            canon_data.update({
+                question.category: answer
+                for question, answer in zip(remaining, answers)
+            })
 
             # Step 3: Structure canon
             canon = {
-                "notebook_id": self.notebook_id,
+                "notebook_id": notebook_id,
                 "sources": self._extract_sources(scope_card),
                 "quickstart": "\n".join(canon_data.get("quickstart", [])),
                 "decision_points": canon_data.get("decision_points", []),
                 "templates": canon_data.get("templates", []),
                 "failure_modes": canon_data.get("failure_modes", []),
                 "edge_cases": canon_data.get("edge_cases", []),
+                "fallback_categories": sorted(fallbacks),
             }
 
-            logger.info(f"Canon collection complete. Notebook: {self.notebook_id}")
+            logger.info(f"Canon collection complete. Notebook: {notebook_id}")
             return canon
 
         except Exception as e:
@@ -128,6 +338,173 @@ class NotebookLMIntegration:
             logger.info("Falling back to offline mode...")
             return self._generate_canon_offline(scope_card)
 
+    async def _ask_question(self, notebook_id: str, question: CanonQuestion,
+                            semaphore: asyncio.Semaphore, source_fingerprint: Optional[str] = None,
+                            deadline: Optional[float] = None,
+                            fallbacks: Optional[List[str]] = None) -> any:
+        """
+        Ask one canon question and parse the answer.
+
+        Falls back to ``_get_fallback`` for this category only if the query
+        fails, times out (``query_timeout`` or the Step 3 ``deadline``),
+        returns nothing or cannot be parsed; the category is then appended
+        to ``fallbacks``.
+        """
+        async with semaphore:
+            logger.info(f"Querying {question.category}...")
+            with span("notebooklm.query", "notebooklm", category=question.category) as span_args:
+                timeout = self._remaining(deadline)
+                # Whether running out of time means hitting the Step 3 deadline
+                # rather than the per-query ``query_timeout``
+                deadline_bound = deadline is not None and (
+                    self.query_timeout is None or timeout < self.query_timeout
+                )
+                try:
+                    if timeout is not None and timeout <= 0:
+                        raise asyncio.TimeoutError
+                    answer = await asyncio.wait_for(
+                        self._query_notebook(
+                            notebook_id, question.question, source_fingerprint, question.max_lines
+                        ),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(f"Query for {question.category} timed out after {timeout}s")
+                    if deadline_bound:
+                        self.deadline_fallbacks += 1
+                    span_args["timeout"] = True
+                    answer = None
+                except Exception as e:
+                    logger.error(f"Error querying {question.category}: {e}")
+                    answer = None
+
+        if answer:
+            try:
+                return question.parser_fn(answer)
+            except Exception as e:
+                logger.error(f"Could not parse answer for {question.category}: {e}")
+
+        logger.warning(f"No answer for {question.category}, using fallback")
+        if fallbacks is not None:
+            fallbacks.append(question.category)
+        return self._get_fallback(question.category)
+
+    async def _ask_batched(self, notebook_id: str, source_fingerprint: Optional[str] = None,
+                           deadline: Optional[float] = None) -> Dict:
+        """
+        Ask every canon question in one composite query.
+
+        Returns:
+            Parsed answers for the categories the response covered; the
+            caller asks the missing ones individually (all of them if the
+            response is malformed)
+        """
+        with span("notebooklm.query", "notebooklm", category="batch") as span_args:
+            try:
+                response = await asyncio.wait_for(
+                    self._query_notebook(notebook_id, self._batched_prompt(), source_fingerprint),
+                    self._remaining(deadline),
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Batched query timed out")
+                span_args["timeout"] = True
+                response = None
+            except Exception as e:
+                logger.error(f"Error in batched query: {e}")
+                response = None
+
+            sections = self._split_batched(response or "")
+            answers = {}
+            for question in self.CANON_QUESTIONS:
+                if not sections.get(question.category):
+                    continue
+                try:
+                    answers[question.category] = question.parser_fn(sections[question.category])
+                except Exception as e:
+                    logger.error(f"Could not parse batched answer for {question.category}: {e}")
+            span_args["answered"] = len(answers)
+
+        missing = len(self.CANON_QUESTIONS) - len(answers)
+        if missing:
+            logger.warning(f"Batched answer covered {len(answers)} categories, asking {missing} individually")
+        return answers
+
+    def _batched_prompt(self) -> str:
+        """Composite prompt asking for one delimited section per category."""
+        parts = [
+            "Answer each of the following questions. Start each answer with its "
+            "header line exactly as shown (e.g. '### quickstart') and put nothing "
+            "outside the answers."
+        ]
+        for question in self.CANON_QUESTIONS:
+            parts.append(f"### {question.category}\n{question.question}")
+        return "\n\n".join(parts)
+
+    def _split_batched(self, response: str) -> Dict[str, str]:
+        """
+        Split a batched answer into per-category text.
+
+        Only header lines naming a known category start a section; text
+        before the first header is dropped. A category appearing twice is
+        treated as malformed and left out.
+        """
+        categories = {q.category for q in self.CANON_QUESTIONS}
+        sections: Dict[str, List[str]] = {}
+        duplicates = set()
+        current = None
+
+        for line in response.splitlines():
+            # Headers look like "### category", "**category**:" or "[category]"
+            if len(line) <= 64:
+                name = line.strip().lstrip("#*[ ").rstrip(":*] ").lower().replace(" ", "_").replace("-", "_")
+                if name in categories:
+                    if name in sections:
+                        duplicates.add(name)
+                    current = name
+                    sections.setdefault(name, [])
+                    continue
+            if current is not None:
+                sections[current].append(line)
+
+        return {
+            name: "\n".join(lines).strip()
+            for name, lines in sections.items()
+            if name not in duplicates
+        }
+
+    async def _get_notebook(self, scope_card: Dict, fingerprint: str) -> Optional[str]:
+        """Reuse the notebook registered for this scope, or create one."""
+        if self.registry:
+            notebook_id = self.registry.lookup(fingerprint)
+            if notebook_id:
+                logger.info(f"Reusing NotebookLM notebook {notebook_id} (unchanged scope)")
+                return notebook_id
+
+        if fingerprint in self._creating:
+            return await asyncio.shield(self._creating[fingerprint])
+
+        logger.info("Creating NotebookLM notebook...")
+        creation = asyncio.ensure_future(self._create_notebook(scope_card))
+        self._creating[fingerprint] = creation
+        creation.add_done_callback(lambda task: self._notebook_created(fingerprint, task))
+        with span("notebooklm.create_notebook", "notebooklm"):
+            return await asyncio.shield(creation)
+
+    def _notebook_created(self, fingerprint: str, creation: asyncio.Future) -> None:
+        """
+        Register a finished notebook creation.
+
+        Runs as the creation's done-callback, so a notebook whose waiters all
+        gave up (e.g. at the Step 3 deadline) is still registered for reuse
+        instead of leaking, and later runs can join the creation meanwhile.
+        """
+        self._creating.pop(fingerprint, None)
+        if creation.cancelled() or creation.exception() is not None:
+            return
+        notebook_id = creation.result()
+        if notebook_id and self.registry:
+            self.registry.register(fingerprint, notebook_id)
+
     async def _create_notebook(self, scope_card: Dict) -> Optional[str]:
         """
         Create a NotebookLM notebook for the skill.
@@ -139,18 +516,16 @@ class NotebookLMIntegration:
             scope_doc = self._create_scope_document(scope_card)
             notebook_name = f"SkillForge: {scope_card.get('goal', 'skill')[:30]}"
 
+            if self.backend is not None:
+                return await self._call_backend(self.backend.create_notebook, notebook_name, scope_doc)
+
             # Use notebooklm-query to upload
             # This is a simplified version - in production would call actual CLI
             logger.info(f"Would upload document to create notebook: {notebook_name}")
 
             # For now, return a placeholder
-            # In real implementation, would call:
-            # result = subprocess.run([
-            #     "python", "path/to/upload_documents.py",
-            #     "--name", notebook_name,
-            #     "--files", temp_doc_path,
-            #     "--output-format", "json"
-            # ], capture_output=True, text=True)
+            # Configure ``workers`` to run upload_documents.py in warm worker
+            # processes (see notebooklm_workers.py)
 
             return "notebook_xyz123"  # Placeholder
 
@@ -158,7 +533,133 @@ class NotebookLMIntegration:
             logger.error(f"Error creating notebook: {e}")
             return None
 
-    async def _query_notebook(self, notebook_id: str, question: str) -> Optional[str]:
+    async def _query_notebook(self, notebook_id: str, question: str,
+                              source_fingerprint: Optional[str] = None,
+                              max_lines: Optional[int] = None) -> Optional[str]:
+        """
+        Query a NotebookLM notebook, answering from the response cache when possible.
+
+        Args:
+            notebook_id: Notebook to query
+            question: Question text
+            source_fingerprint: Hash of the notebook's sources; answers are
+                only reused for the same source set
+            max_lines: Leading lines the caller needs; with ``stream_answers``
+                the answer may be cut off after them
+
+        Streamed answers may be cut off after ``max_lines``, so they are
+        cached under a key that includes it, apart from full answers.
+        """
+        if self.response_cache is None:
+            return await self._query_hedged(notebook_id, question, max_lines)
+
+        key = cache_key(notebook_id, " ".join(question.lower().split()), source_fingerprint)
+        if self._streams(max_lines):
+            key = cache_key(key, f"max_lines={max_lines}")
+        with span("notebooklm.cache_lookup", "notebooklm") as span_args:
+            cached = self.response_cache.get(key, namespace=notebook_id)
+            span_args["hit"] = cached is not None
+        if cached is not None:
+            self.cache_bytes_saved += len(cached.encode("utf-8"))
+            return cached
+
+        answer = await self._query_hedged(notebook_id, question, max_lines)
+        if answer:
+            self.response_cache.put(key, answer, namespace=notebook_id)
+        return answer
+
+    def _streams(self, max_lines: Optional[int]) -> bool:
+        """Whether a query needing ``max_lines`` lines is read as a (cut-off) stream."""
+        return bool(
+            self.stream_answers and max_lines and self.backend is not None
+            and hasattr(self.backend, "query_stream")
+        )
+
+    async def _query_hedged(self, notebook_id: str, question: str,
+                            max_lines: Optional[int] = None) -> Optional[str]:
+        """
+        Query remotely, sending a duplicate if the first call is slow.
+
+        Without hedging (or before a hedge delay is known) this is a plain
+        ``_query_remote``. Otherwise, if no answer arrives within the hedge
+        delay, a second identical query is sent; the first non-empty answer
+        wins and the other call is cancelled.
+        """
+        delay = self._hedge_delay()
+        started = time.perf_counter()
+        if delay is None:
+            answer = await self._query_remote(notebook_id, question, max_lines)
+            if answer:
+                self.query_latencies.append(time.perf_counter() - started)
+            return answer
+
+        primary = asyncio.ensure_future(self._query_remote(notebook_id, question, max_lines))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedges_sent += 1
+                with span("notebooklm.hedge", "notebooklm", delay=round(delay, 4)):
+                    tasks.add(asyncio.ensure_future(self._query_remote(notebook_id, question, max_lines)))
+
+            answer = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None and task.result():
+                        answer = task.result()
+                        if task is not primary:
+                            self.hedges_won += 1
+                        break
+                if answer:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if answer:
+            self.query_latencies.append(time.perf_counter() - started)
+        return answer
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None to not hedge."""
+        if not self.hedge:
+            return None
+        if self.hedge_after is not None:
+            return self.hedge_after
+        if len(self.query_latencies) < self.hedge_min_samples:
+            return None
+        ordered = sorted(self.query_latencies)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        """Seconds left for one query: ``query_timeout`` capped by the Step 3 deadline."""
+        if deadline is None:
+            return self.query_timeout
+        remaining = max(0.0, deadline - asyncio.get_running_loop().time())
+        return remaining if self.query_timeout is None else min(self.query_timeout, remaining)
+
+    def query_stats(self) -> Dict:
+        """Remote query latency percentiles, hedging and deadline counters."""
+        ordered = sorted(self.query_latencies)
+
+        def percentile(pct: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)] * 1000, 3)
+
+        return {
+            "samples": len(ordered),
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "deadline_fallbacks": self.deadline_fallbacks,
+            "streams_cancelled": self.streams_cancelled,
+        }
+
+    async def _query_remote(self, notebook_id: str, question: str,
+                            max_lines: Optional[int] = None) -> Optional[str]:
         """
         Query a NotebookLM notebook for information.
 
@@ -167,13 +668,10 @@ class NotebookLMIntegration:
         try:
             logger.debug(f"Querying notebook {notebook_id}: {question[:50]}...")
 
-            # Simplified - in real implementation would call:
-            # result = subprocess.run([
-            #     "python", "path/to/query_notebook.py",
-            #     "--notebook-id", notebook_id,
-            #     "--question", question,
-            #     "--output-format", "json"
-            # ], capture_output=True, text=True)
+            if self.backend is not None:
+                if self._streams(max_lines):
+                    return await self._call_backend(self._read_stream, notebook_id, question, max_lines)
+                return await self._call_backend(self.backend.query, notebook_id, question)
 
             # Mock response for now
             return f"Response to: {question}"
@@ -182,11 +680,97 @@ class NotebookLMIntegration:
             logger.error(f"Error querying notebook: {e}")
             return None
 
+    async def _read_stream(self, notebook_id: str, question: str, max_lines: int) -> Optional[str]:
+        """
+        Read a streamed answer until ``max_lines`` complete lines arrive.
+
+        The stream is closed (cancelling the remote answer) as soon as
+        enough lines are read, so only the part the parser uses is received.
+        """
+        stream = self.backend.query_stream(notebook_id, question)
+        lines: List[str] = []
+        partial = ""
+        with span("notebooklm.stream", "notebooklm") as span_args:
+            try:
+                async for chunk in stream:
+                    partial += chunk
+                    *complete, partial = partial.split("\n")
+                    lines.extend(complete)
+                    if len(lines) >= max_lines:
+                        self.streams_cancelled += 1
+                        span_args["cancelled"] = True
+                        break
+                else:
+                    if partial:
+                        lines.append(partial)
+            finally:
+                aclose = getattr(stream, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+            span_args["lines"] = min(len(lines), max_lines)
+        return "\n".join(lines[:max_lines]) or None
+
+    async def _call_backend(self, fn, *args):
+        """Call the backend through the rate limiter, if any."""
+        if self.rate_limiter is None:
+            return await fn(*args)
+        with span("notebooklm.rate_limit", "notebooklm") as span_args:
+            result = await self.rate_limiter.call(fn, *args)
+            span_args["concurrency_limit"] = round(self.rate_limiter.concurrency_limit, 2)
+        return result
+
+    def limiter_stats(self) -> Optional[Dict]:
+        """Rate limiter state (shared across instances), or None without a backend."""
+        if self.backend is None or self.rate_limiter is None:
+            return None
+        return self.rate_limiter.stats()
+
+    async def aclose(self) -> None:
+        """Stop the backend's worker processes, if any."""
+        close = getattr(self.backend, "close", None)
+        if close is not None:
+            await close()
+
+    def close(self) -> None:
+        """Kill the backend's worker processes without waiting."""
+        terminate = getattr(self.backend, "terminate", None)
+        if terminate is not None:
+            terminate()
+
+    def invalidate(self, notebook_id: str) -> int:
+        """
+        Drop all cached answers for a notebook (e.g. after its sources change)
+        and stop reusing it.
+
+        Returns:
+            Number of cached answers removed
+        """
+        if self.registry:
+            self.registry.forget(notebook_id)
+        if self.response_cache is None:
+            return 0
+        return self.response_cache.invalidate(notebook_id)
+
+    def cache_stats(self) -> Optional[Dict]:
+        """Answer cache hit rate and bytes saved, or None when caching is off."""
+        if self.response_cache is None:
+            return None
+        stats = self.response_cache.stats()
+        stats["bytes_saved"] = self.cache_bytes_saved
+        return stats
+
+    def _source_fingerprint(self, scope_card: Dict) -> str:
+        """Hash of the documents and sources a notebook is built from."""
+        return cache_key(self._create_scope_document(scope_card), self._extract_sources(scope_card))
+
     def _generate_canon_offline(self, scope_card: Dict) -> Dict:
         """
         Generate canonical knowledge offline (fallback mode).
 
-        Used when NotebookLM is not available.
+        Used when NotebookLM is not available. Each section is filled with
+        the most relevant passages from the local knowledge index
+        (references/ plus ``corpus_dirs``), topped up with generated
+        defaults where the index has too little.
         """
         logger.info("Generating canon offline (fallback mode)...")
 
@@ -194,17 +778,51 @@ class NotebookLMIntegration:
         must_cover = scope_card.get("must_cover", [])
         must_not_cover = scope_card.get("must_not_cover", [])
 
+        with span("notebooklm.offline_canon", "notebooklm") as span_args:
+            query = " ".join([goal] + must_cover + scope_card.get("trigger_words", []))
+            try:
+                hits = {
+                    kind: self.knowledge_index.search(query, kind=kind, k=5)
+                    for kind in ("quickstart", "decision_point", "template", "failure_mode", "edge_case")
+                }
+            except Exception as e:
+                logger.error(f"Knowledge index unavailable: {e}")
+                hits = {}
+            span_args["passages"] = sum(len(found) for found in hits.values())
+
+        quickstart = self._generate_quickstart(goal, must_cover)
+        if hits.get("quickstart"):
+            steps = [step.strip() for step in hits["quickstart"][0]["text"].split(",") if step.strip()]
+            quickstart = "\n".join(f"{i}. {step}" for i, step in enumerate(steps, 1))
+
+        generated_failures = self._generate_failure_modes(goal)
+        failure_modes = [{"symptom": h["symptom"], "fix": h["fix"]} for h in hits.get("failure_mode", [])]
+        failure_modes += generated_failures[:max(0, 5 - len(failure_modes))]
+
+        templates = [{"name": h["name"], "content": h["text"]} for h in hits.get("template", [])[:3]]
+        templates += self._generate_templates(must_cover)[:max(0, 2 - len(templates))]
+
+        edge_cases = [h["text"] for h in hits.get("edge_case", [])]
+        edge_cases += self._generate_edge_cases(must_not_cover)[:max(0, 3 - len(edge_cases))]
+
+        sources = [{"title": "Best Practices", "url": "N/A", "relevance": "primary"},
+                   {"title": "Common Patterns", "url": "N/A", "relevance": "secondary"}]
+        used = sorted({h["source"] for found in hits.values() for h in found})
+        if used:
+            sources = [{"title": f"Local knowledge: {source}", "url": source, "relevance": "primary"}
+                       for source in used]
+
         canon = {
             "notebook_id": None,
-            "sources": [
-                {"title": "Best Practices", "url": "N/A", "relevance": "primary"},
-                {"title": "Common Patterns", "url": "N/A", "relevance": "secondary"},
-            ],
-            "quickstart": self._generate_quickstart(goal, must_cover),
-            "decision_points": self._generate_decision_points(must_cover),
-            "templates": self._generate_templates(must_cover),
-            "failure_modes": self._generate_failure_modes(goal),
-            "edge_cases": self._generate_edge_cases(must_not_cover),
+            "sources": sources,
+            "quickstart": quickstart,
+            "decision_points": (
+                [h["text"] for h in hits.get("decision_point", [])]
+                + self._generate_decision_points(must_cover)
+            )[:5],
+            "templates": templates,
+            "failure_modes": failure_modes,
+            "edge_cases": edge_cases,
         }
 
         return canon
@@ -262,7 +880,7 @@ class NotebookLMIntegration:
     def _generate_edge_cases(self, must_not_cover: List[str]) -> List[str]:
         """Generate edge cases from out-of-scope items."""
         return [
-            f"Handling {item} (explicitly excluded)",
+            "Handling out-of-scope requests (explicitly excluded)",
             "Empty or malformed inputs",
             "Boundary conditions and limits",
         ] + [f"When {item} is required" for item in must_not_cover[:2]]
@@ -0,0 +1,525 @@
+"""
+NotebookLM Workers - Warm worker-process pool for the notebooklm-query backend
+
+Spawning ``upload_documents.py`` / ``query_notebook.py`` per call pays
+interpreter startup and imports every time. Instead, a small pool of
+long-lived worker processes imports each notebooklm-query script once and
+calls its ``main()`` per request, so the interpreter, imported modules and
+anything the scripts create at module level stay warm between requests.
+The scripts expose no hook for sharing a client or browser session, so
+whatever ``main()`` itself sets up (including authentication done there)
+is still rebuilt on every call.
+
+Protocol: newline-delimited JSON over the worker's stdin/stdout. Each
+request line is
+
+    {"id": 1, "op": "create_notebook" | "query" | "ping", "params": {...}}
+
+and is answered by one line
+
+    {"id": 1, "ok": true, "result": ...}   or   {"id": 1, "ok": false, "error": "..."}
+
+Throttling errors add ``"throttled": true`` and an optional
+``"retry_after"`` (seconds), re-raised by the pool as ThrottledError.
+
+A worker handles one request at a time. The pool checks idle workers with
+a ping before reuse, replaces workers that die or time out, recycles each
+worker after ``max_requests`` requests, and rejects requests once
+``max_queue`` callers are already waiting for a worker.
+
+Run a worker directly with:
+
+    python notebooklm_workers.py --query-path /path/to/notebooklm-query/scripts
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import importlib.util
+import os
+import re
+import runpy
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from .rate_limiter import ThrottledError, is_throttled
+except ImportError:
+    from rate_limiter import ThrottledError, is_throttled
+
+logger = logging.getLogger(__name__)
+
+# Answers and uploaded documents can exceed asyncio's 64 KiB default line limit
+STREAM_LIMIT = 64 * 1024 * 1024
+
+
+class NotebookLMWorker:
+    """One long-lived worker process."""
+
+    def __init__(self, command: List[str], startup_timeout: float = 30.0):
+        """
+        Initialize the worker (the process is spawned by ``start``).
+
+        Args:
+            command: Command line that starts a JSON-lines worker
+            startup_timeout: Seconds allowed for spawning and the first ping
+        """
+        self.command = command
+        self.startup_timeout = startup_timeout
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.requests_served = 0
+        self.last_used = 0.0
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    async def start(self) -> None:
+        """Spawn the process and wait until it answers a ping."""
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT,
+        )
+        try:
+            await self.request("ping", timeout=self.startup_timeout)
+        except BaseException:
+            self.kill()
+            raise
+        # The startup ping does not count towards recycling
+        self.requests_served = 0
+
+    async def request(self, op: str, params: Optional[Dict] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Send one request and return its result.
+
+        Raises:
+            ConnectionError: If the worker exited or closed its stdout
+            asyncio.TimeoutError: If no answer arrives within ``timeout``
+            ThrottledError: If the worker reports throttling
+            RuntimeError: If the worker reports another error
+        """
+        if not self.alive:
+            raise ConnectionError("NotebookLM worker is not running")
+
+        self._next_id += 1
+        request_id = self._next_id
+        line = json.dumps({"id": request_id, "op": op, "params": params or {}}) + "\n"
+
+        async def roundtrip() -> bytes:
+            self.process.stdin.write(line.encode("utf-8"))
+            await self.process.stdin.drain()
+            return await self.process.stdout.readline()
+
+        try:
+            raw = await asyncio.wait_for(roundtrip(), timeout)
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise ConnectionError(f"NotebookLM worker {self.pid} exited") from e
+
+        self.requests_served += 1
+        self.last_used = time.monotonic()
+
+        if not raw:
+            raise ConnectionError(f"NotebookLM worker {self.pid} closed its output")
+        response = json.loads(raw)
+        if response.get("id") != request_id:
+            raise ConnectionError(f"NotebookLM worker {self.pid} answered out of order")
+        if response.get("throttled"):
+            raise ThrottledError(response.get("error") or "Throttled", response.get("retry_after"))
+        if not response.get("ok"):
+            raise RuntimeError(f"NotebookLM worker error: {response.get('error')}")
+        return response.get("result")
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Ask the worker to exit (EOF on stdin), killing it if it lingers."""
+        if not self.alive:
+            return
+        try:
+            self.process.stdin.close()
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except (asyncio.TimeoutError, OSError):
+            self.kill()
+            await self.process.wait()
+
+    def kill(self) -> None:
+        if self.alive:
+            self.process.kill()
+
+
+class NotebookLMWorkerPool:
+    """
+    Pool of warm NotebookLM worker processes.
+
+    Implements the NotebookLMIntegration backend interface
+    (``create_notebook`` / ``query``).
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        size: int = 2,
+        max_requests: int = 200,
+        max_queue: int = 100,
+        request_timeout: Optional[float] = 120.0,
+        health_check_after: float = 30.0,
+        startup_timeout: float = 30.0,
+    ):
+        """
+        Initialize the pool (workers are spawned on first use).
+
+        Args:
+            command: Command line that starts a JSON-lines worker
+            size: Number of worker processes
+            max_requests: Requests after which a worker is recycled
+            max_queue: Maximum callers waiting for a worker; further
+                requests fail immediately instead of queueing
+            request_timeout: Seconds before a request is abandoned and its
+                worker replaced (None = no limit)
+            health_check_after: Ping workers idle for longer than this
+                before handing them out
+            startup_timeout: Seconds allowed for a worker to start
+        """
+        if size < 1:
+            raise ValueError(f"size must be >= 1, got {size}")
+
+        self.command = command
+        self.size = size
+        self.max_requests = max_requests
+        self.max_queue = max_queue
+        self.request_timeout = request_timeout
+        self.health_check_after = health_check_after
+        self.startup_timeout = startup_timeout
+
+        self.workers: List[NotebookLMWorker] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._replacements = set()
+        self.waiting = 0
+        self.busy = 0
+
+        self.requests = 0
+        self.failures = 0
+        self.rejected = 0
+        self.recycled = 0
+        self.restarts = 0
+
+    @classmethod
+    def for_query_skill(cls, notebooklm_query_path: str, **kwargs) -> "NotebookLMWorkerPool":
+        """Pool of workers running the notebooklm-query skill scripts in-process."""
+        command = [sys.executable, str(Path(__file__).resolve()), "--query-path", str(notebooklm_query_path)]
+        return cls(command, **kwargs)
+
+    async def start(self) -> None:
+        """Spawn all workers (called automatically on first request)."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            idle = asyncio.Queue()
+            workers = [self._new_worker() for _ in range(self.size)]
+            await asyncio.gather(*(worker.start() for worker in workers))
+            for worker in workers:
+                self.workers.append(worker)
+                idle.put_nowait(worker)
+            self._idle = idle
+            logger.info(f"Started {self.size} NotebookLM workers")
+
+    async def request(self, op: str, **params) -> Any:
+        """
+        Run one request on an idle worker.
+
+        Raises:
+            RuntimeError: If ``max_queue`` callers are already waiting, or
+                the worker reports an error
+            ConnectionError / asyncio.TimeoutError: If the worker died or
+                timed out (it is replaced)
+        """
+        if self._idle is None:
+            await self.start()
+
+        if self._idle.empty() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise RuntimeError(f"NotebookLM worker pool queue is full ({self.waiting} waiting)")
+
+        self.waiting += 1
+        try:
+            worker = await self._idle.get()
+        finally:
+            self.waiting -= 1
+        self.busy += 1
+
+        # Stays False if the request is cancelled or times out mid-flight:
+        # the worker may still answer, so its stream can't be trusted
+        healthy = False
+        try:
+            worker = await self._checked(worker)
+            self.requests += 1
+            result = await worker.request(op, params, timeout=self.request_timeout)
+            healthy = True
+            return result
+        except (ConnectionError, asyncio.TimeoutError, json.JSONDecodeError):
+            self.failures += 1
+            raise
+        except RuntimeError:
+            # The worker answered with an error; it is still usable
+            self.failures += 1
+            healthy = True
+            raise
+        finally:
+            self.busy -= 1
+            self._release(worker, healthy)
+
+    async def create_notebook(self, name: str, document: str) -> Optional[str]:
+        return await self.request("create_notebook", name=name, document=document)
+
+    async def query(self, notebook_id: str, question: str) -> Optional[str]:
+        return await self.request("query", notebook_id=notebook_id, question=question)
+
+    async def health_check(self) -> Dict[str, int]:
+        """Ping every idle worker now, replacing those that fail."""
+        if self._idle is None:
+            return {"checked": 0, "replaced": 0}
+        checked = replaced = 0
+        for _ in range(self._idle.qsize()):
+            worker = self._idle.get_nowait()
+            checked += 1
+            if not await self._ping(worker):
+                replaced += 1
+                self._release(worker, healthy=False)
+            else:
+                self._idle.put_nowait(worker)
+        return {"checked": checked, "replaced": replaced}
+
+    def stats(self) -> Dict[str, int]:
+        """Pool counters for monitoring."""
+        return {
+            "size": self.size,
+            "alive": sum(1 for worker in self.workers if worker.alive),
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "busy": self.busy,
+            "starting": len(self._replacements),
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "recycled": self.recycled,
+            "restarts": self.restarts,
+        }
+
+    async def close(self) -> None:
+        """Stop all workers."""
+        for task in list(self._replacements):
+            task.cancel()
+        await asyncio.gather(*(worker.close() for worker in self.workers), return_exceptions=True)
+        self.workers = []
+        self._idle = None
+
+    def terminate(self) -> None:
+        """Kill all workers without waiting (for synchronous shutdown paths)."""
+        for worker in self.workers:
+            worker.kill()
+        self.workers = []
+        self._idle = None
+
+    def _new_worker(self) -> NotebookLMWorker:
+        return NotebookLMWorker(self.command, startup_timeout=self.startup_timeout)
+
+    async def _ping(self, worker: NotebookLMWorker) -> bool:
+        try:
+            await worker.request("ping", timeout=min(self.startup_timeout, 5.0))
+            return True
+        except Exception as e:
+            logger.warning(f"NotebookLM worker {worker.pid} failed health check: {e}")
+            return False
+
+    async def _checked(self, worker: NotebookLMWorker) -> NotebookLMWorker:
+        """Return a healthy worker, replacing this one inline if it fails its check."""
+        if worker.alive and time.monotonic() - worker.last_used <= self.health_check_after:
+            return worker
+        if worker.alive and await self._ping(worker):
+            return worker
+        self.restarts += 1
+        self._retire(worker)
+        replacement = self._new_worker()
+        await replacement.start()
+        self.workers.append(replacement)
+        return replacement
+
+    def _release(self, worker: NotebookLMWorker, healthy: bool) -> None:
+        """Return a worker to the pool, or replace it in the background."""
+        if self._idle is None:
+            worker.kill()
+            return
+        if healthy and worker.alive and worker.requests_served < self.max_requests:
+            self._idle.put_nowait(worker)
+            return
+
+        if healthy and worker.alive:
+            logger.debug(f"Recycling NotebookLM worker {worker.pid} after {worker.requests_served} requests")
+            self.recycled += 1
+        else:
+            self.restarts += 1
+        task = asyncio.ensure_future(self._replace(worker))
+        self._replacements.add(task)
+        task.add_done_callback(self._replacements.discard)
+
+    async def _replace(self, worker: NotebookLMWorker) -> None:
+        self._retire(worker)
+        await worker.close()
+        while self._idle is not None:
+            replacement = self._new_worker()
+            try:
+                await replacement.start()
+            except Exception as e:
+                logger.error(f"Could not start NotebookLM worker: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if self._idle is None:
+                replacement.kill()
+                return
+            self.workers.append(replacement)
+            self._idle.put_nowait(replacement)
+            return
+
+    def _retire(self, worker: NotebookLMWorker) -> None:
+        if worker in self.workers:
+            self.workers.remove(worker)
+
+
+class QuerySkillHandler:
+    """
+    Worker-side handler running the notebooklm-query scripts in-process.
+
+    Each script is imported once, as a module, and its ``main()`` called
+    with the request's arguments, so module-level state (clients, caches)
+    persists across requests. State created inside ``main()`` does not:
+    the scripts offer no way to keep it. A script without ``main()`` is run
+    as ``__main__`` from scratch on every request.
+    """
+
+    def __init__(self, notebooklm_query_path: str):
+        self.scripts_dir = Path(notebooklm_query_path)
+        if str(self.scripts_dir) not in sys.path:
+            sys.path.insert(0, str(self.scripts_dir))
+        # script name -> imported module (None: run as __main__ each time)
+        self._modules: Dict[str, Any] = {}
+
+    def ping(self) -> Dict:
+        return {"pid": os.getpid()}
+
+    def create_notebook(self, name: str, document: str) -> Optional[str]:
+        with tempfile.NamedTemporaryFile("w", suffix=".md", delete=False) as f:
+            f.write(document)
+        try:
+            output = self._run_script(
+                "upload_documents.py",
+                ["--name", name, "--files", f.name, "--output-format", "json"],
+            )
+        finally:
+            os.unlink(f.name)
+        data = json.loads(output)
+        return data.get("notebook_id") or data.get("id")
+
+    def query(self, notebook_id: str, question: str) -> Optional[str]:
+        output = self._run_script(
+            "query_notebook.py",
+            ["--notebook-id", notebook_id, "--question", question, "--output-format", "json"],
+        )
+        try:
+            data = json.loads(output)
+        except json.JSONDecodeError:
+            return output.strip() or None
+        return data.get("answer") if isinstance(data, dict) else str(data)
+
+    def _run_script(self, script: str, args: List[str]) -> str:
+        """Run a script's ``main()`` with ``args`` in this process and return its stdout."""
+        path = self.scripts_dir / script
+        main = getattr(self._load(script), "main", None)
+        buffer = io.StringIO()
+        saved_argv = sys.argv
+        sys.argv = [str(path)] + args
+        try:
+            with contextlib.redirect_stdout(buffer):
+                if callable(main):
+                    status = main()
+                    if isinstance(status, int) and status != 0:
+                        raise SystemExit(status)
+                else:
+                    runpy.run_path(str(path), run_name="__main__")
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                raise RuntimeError(f"{script} exited with status {e.code}") from e
+        finally:
+            sys.argv = saved_argv
+        return buffer.getvalue()
+
+    def _load(self, script: str):
+        """
+        Import a script as a module, once per worker.
+
+        Returns None for scripts without a top-level ``main()``: they may do
+        their work at import time, so they are only ever run as __main__.
+        """
+        if script not in self._modules:
+            path = self.scripts_dir / script
+            if not re.search(r"^def main\(", path.read_text(), re.MULTILINE):
+                self._modules[script] = None
+                return None
+            spec = importlib.util.spec_from_file_location(f"notebooklm_query_{path.stem}", path)
+            module = importlib.util.module_from_spec(spec)
+            with contextlib.redirect_stdout(sys.stderr):
+                spec.loader.exec_module(module)
+            self._modules[script] = module
+        return self._modules[script]
+
+
+def serve_worker(handler) -> None:
+    """Answer JSON-lines requests on stdin with ``handler`` methods until EOF."""
+    # Keep the real stdout for the protocol; anything else printed goes to stderr
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    sys.stdout = sys.stderr
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            method = getattr(handler, request.get("op") or "", None)
+            if method is None or request["op"].startswith("_"):
+                raise ValueError(f"Unknown op: {request.get('op')!r}")
+            response = {"id": request_id, "ok": True, "result": method(**request.get("params", {}))}
+        except Exception as e:
+            response = {"id": request_id, "ok": False, "error": str(e)}
+            if is_throttled(e):
+                response["throttled"] = True
+                response["retry_after"] = getattr(e, "retry_after", None)
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NotebookLM JSON-lines worker")
+    parser.add_argument("--query-path", required=True, help="notebooklm-query skill scripts directory")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    serve_worker(QuerySkillHandler(args.query_path))
+
+
+if __name__ == "__main__":
+    main()
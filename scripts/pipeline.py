@@ -0,0 +1,197 @@
+"""
+Pipeline Scheduler - Dependency-driven execution of SkillForge steps
+
+Each step declares the values it reads (inputs) and the single value it
+produces (its name). The scheduler starts every step as soon as all of its
+inputs are available, so independent steps (e.g. Step 3 canon collection
+and the Step 5 interview, which both only need the scope card) overlap.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from .tracing import span
+except ImportError:
+    from tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineStep:
+    """A pipeline step: produces the value ``name`` from ``inputs``."""
+    name: str
+    fn: Callable[..., Any]  # Called with inputs as keyword args; may be async
+    inputs: List[str] = field(default_factory=list)
+    label: Optional[str] = None  # Human-readable description for logs
+    after: List[str] = field(default_factory=list)  # Ordering-only dependencies
+    # Other steps' outputs this step may supply early. When set, ``fn``
+    # returns (output, {value name: value}) and the supplied values are
+    # published as if those steps had run (e.g. a cache hit). They replace
+    # outputs already produced, and supplied steps still running are
+    # cancelled, so steps reading them should wait for this one (``after``).
+    provides: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PipelineEvent:
+    """Progress event emitted while a pipeline runs."""
+    type: str  # One of the event type constants below
+    run_id: str
+    elapsed: float  # Seconds since the run started
+    step: Optional[str] = None
+    data: Any = None  # Step output, error message or final result
+
+    RUN_STARTED = "run_started"
+    STEP_RESTORED = "step_restored"
+    STEP_STARTED = "step_started"
+    STEP_FINISHED = "step_finished"
+    STEP_FAILED = "step_failed"
+    RUN_FINISHED = "run_finished"
+
+
+async def _maybe_await(value: Any) -> Any:
+    """Await ``value`` if a callback returned an awaitable."""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class StepScheduler:
+    """Runs pipeline steps in dependency order, concurrently where possible."""
+
+    def __init__(self, steps: List[PipelineStep]):
+        """
+        Initialize the scheduler.
+
+        Args:
+            steps: Pipeline steps; step names must be unique
+
+        Raises:
+            ValueError: If step names are duplicated
+        """
+        names = [step.name for step in steps]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate pipeline steps: {sorted(duplicates)}")
+
+        self.steps = steps
+
+    async def run(
+        self,
+        values: Dict[str, Any],
+        on_step_complete: Optional[Callable[[str, Any], None]] = None,
+        on_step_start: Optional[Callable[[str], None]] = None,
+        on_step_error: Optional[Callable[[str, BaseException], None]] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Run every step whose output is not already in ``values``.
+
+        Args:
+            values: Initial values (request inputs, restored checkpoints);
+                updated in place with each step's output
+            on_step_complete: Called with (step name, output) as each step
+                finishes (or its output is supplied by another step)
+            on_step_start: Called with the step name as each step starts
+            on_step_error: Called with (step name, exception) when a step fails
+
+        Callbacks may be coroutine functions; the scheduler awaits them before
+        going on, so a slow event consumer holds the pipeline back.
+
+        Returns:
+            Per-step timings: {step: {"start", "end", "duration"}} in seconds,
+            relative to the start of this call
+
+        Raises:
+            ValueError: If some step's inputs can never be satisfied
+            Exception: The first exception raised by a step, once the steps
+                already running have finished; no new steps are started
+        """
+        origin = time.perf_counter()
+        timings = {}
+        pending = [step for step in self.steps if step.name not in values]
+        running = {}
+
+        async def execute(step: PipelineStep) -> Any:
+            if step.label:
+                logger.info(f"{step.label}...")
+            if on_step_start:
+                await _maybe_await(on_step_start(step.name))
+            with span(step.name, "step"):
+                started = time.perf_counter()
+                output = step.fn(**{name: values[name] for name in step.inputs})
+                if asyncio.iscoroutine(output):
+                    output = await output
+                ended = time.perf_counter()
+            timings[step.name] = {
+                "start": round(started - origin, 6),
+                "end": round(ended - origin, 6),
+                "duration": round(ended - started, 6),
+            }
+            return output
+
+        failure = None
+        try:
+            while (pending and failure is None) or running:
+                if failure is None:
+                    ready = [
+                        step for step in pending
+                        if all(name in values for name in step.inputs + step.after)
+                    ]
+                    for step in ready:
+                        pending.remove(step)
+                        running[asyncio.ensure_future(execute(step))] = step
+
+                if not running:
+                    missing = {
+                        step.name: [i for i in step.inputs + step.after if i not in values]
+                        for step in pending
+                    }
+                    raise ValueError(f"Unsatisfiable pipeline inputs: {missing}")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    if task.cancelled():
+                        # Its output was supplied by another step meanwhile
+                        continue
+                    if task.exception() is not None:
+                        # Let steps already in flight finish (and be reported)
+                        # before surfacing the first failure
+                        failure = failure or task.exception()
+                        if on_step_error:
+                            await _maybe_await(on_step_error(step.name, task.exception()))
+                        continue
+                    output = task.result()
+                    supplied = {}
+                    if step.provides:
+                        output, supplied = output
+                    values[step.name] = output
+                    if on_step_complete:
+                        await _maybe_await(on_step_complete(step.name, output))
+                    for name, value in supplied.items():
+                        if name in step.provides:
+                            values[name] = value
+                            if on_step_complete:
+                                await _maybe_await(on_step_complete(name, value))
+                    for other, other_step in running.items():
+                        if other_step.name in supplied:
+                            other.cancel()
+
+                # Steps whose output was supplied early never run
+                pending = [step for step in pending if step.name not in values]
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        if failure is not None:
+            raise failure
+
+        return timings
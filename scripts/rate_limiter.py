@@ -0,0 +1,265 @@
+"""
+Rate Limiter - Token bucket plus AIMD concurrency control for NotebookLM calls
+
+Every remote call first takes a token from a bucket refilled at ``rate``
+per second (up to ``burst``), then a concurrency slot. The concurrency
+limit adapts AIMD-style: each success raises it by ``increase / limit``
+(about +``increase`` per window of ``limit`` calls), each throttling signal
+multiplies it by ``decrease_factor`` and pauses new calls for the
+server-suggested retry delay or an exponential backoff. Throttled calls are
+retried up to ``max_retries`` times.
+
+One limiter is shared by every NotebookLMIntegration in the process (see
+``shared_limiter``), since they all draw on the same backend quota.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Error text treated as a throttling signal when the backend doesn't raise
+# ThrottledError (e.g. errors relayed from worker processes). Status codes
+# and phrases only, so IDs, file names or timings that merely contain
+# "429" or "quota" don't count
+THROTTLE_PATTERN = re.compile(
+    r"\b429\b|too many requests|\brate[ -]?limit|\bthrottl(?:e|ed|ing)\b"
+    r"|quota (?:exceeded|exhausted)|exceeded (?:your |the )?quota|resource[ _]exhausted",
+    re.IGNORECASE,
+)
+
+
+class ThrottledError(RuntimeError):
+    """Raised by a backend when the service asks the caller to slow down."""
+
+    def __init__(self, message: str = "Throttled by NotebookLM", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_throttled(error: BaseException) -> bool:
+    """Whether an exception signals throttling."""
+    if isinstance(error, ThrottledError):
+        return True
+    return THROTTLE_PATTERN.search(str(error)) is not None
+
+
+class AdaptiveLimiter:
+    """Token bucket plus AIMD concurrency limit."""
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 10,
+        initial_concurrency: float = 4.0,
+        min_concurrency: float = 1.0,
+        max_concurrency: float = 32.0,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_retries: int = 3,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Tokens added per second (sustained calls per second)
+            burst: Bucket capacity (calls allowed back to back)
+            initial_concurrency: Starting concurrency limit
+            min_concurrency: Floor for the concurrency limit
+            max_concurrency: Ceiling for the concurrency limit
+            increase: Additive increase per window of successful calls
+            decrease_factor: Multiplier applied to the limit on throttling
+            backoff_base: First backoff delay after a throttle (doubles per
+                consecutive throttle)
+            backoff_max: Longest backoff delay
+            max_retries: Retries of a throttled call before giving up
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"rate must be > 0 and burst >= 1, got {rate}, {burst}")
+        if not 0 < decrease_factor < 1:
+            raise ValueError(f"decrease_factor must be in (0, 1), got {decrease_factor}")
+
+        self.rate = rate
+        self.burst = burst
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retries = max_retries
+
+        self.concurrency_limit = min(max(initial_concurrency, min_concurrency), max_concurrency)
+        self.tokens = float(burst)
+        self.in_flight = 0
+        self.waiting = 0
+        self.paused_until = 0.0
+        self._refilled_at = time.monotonic()
+        self._consecutive_throttles = 0
+        self._changed: Optional[asyncio.Condition] = None
+        self._loop = None
+
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.throttled = 0
+        self.retries = 0
+        self.wait_seconds = 0.0
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` under the limiter, retrying when throttled.
+
+        Raises:
+            The call's exception once retries are exhausted (or at once for
+            non-throttling errors)
+        """
+        attempt = 0
+        while True:
+            await self._acquire()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                if not is_throttled(e):
+                    self.failures += 1
+                    await self._release()
+                    raise
+                delay = await self._release_throttled(getattr(e, "retry_after", None))
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.retries += 1
+                logger.warning(f"NotebookLM throttled, retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                # Every caller waits out the pause in _acquire
+                continue
+            except BaseException:
+                await self._release()
+                raise
+            await self._release_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limiter state and counters."""
+        self._refill()
+        return {
+            "rate": self.rate,
+            "tokens": round(self.tokens, 3),
+            "concurrency_limit": round(self.concurrency_limit, 3),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "paused_seconds": round(max(0.0, self.paused_until - time.monotonic()), 3),
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily, and again per event loop, since the shared limiter
+        # outlives the loops of successive asyncio.run() calls
+        loop = asyncio.get_running_loop()
+        if self._changed is None or self._loop is not loop:
+            self._changed = asyncio.Condition()
+            self._loop = loop
+        return self._changed
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    async def _acquire(self) -> None:
+        """Wait for the pause to end, a token and a concurrency slot."""
+        started = time.monotonic()
+        self.waiting += 1
+        changed = self._condition()
+        try:
+            async with changed:
+                while True:
+                    now = time.monotonic()
+                    if now < self.paused_until:
+                        delay = self.paused_until - now
+                    elif self.in_flight >= max(1, int(self.concurrency_limit)):
+                        await changed.wait()
+                        continue
+                    else:
+                        self._refill()
+                        if self.tokens >= 1:
+                            break
+                        delay = (1 - self.tokens) / self.rate
+                    # Sleep without holding the lock; wake early on changes
+                    try:
+                        await asyncio.wait_for(changed.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+
+                self.tokens -= 1
+                self.in_flight += 1
+                self.requests += 1
+        finally:
+            self.waiting -= 1
+            self.wait_seconds += time.monotonic() - started
+
+    async def _release(self) -> None:
+        # Free the slot before waiting for the lock: a caller cancelled while
+        # the lock is contended must not keep its slot forever
+        self.in_flight -= 1
+        try:
+            await self._notify()
+        except asyncio.CancelledError:
+            # Waiters still need waking for the freed slot
+            asyncio.ensure_future(self._notify())
+            raise
+
+    async def _notify(self) -> None:
+        changed = self._condition()
+        async with changed:
+            changed.notify_all()
+
+    async def _release_success(self) -> None:
+        self.successes += 1
+        self._consecutive_throttles = 0
+        self.concurrency_limit = min(
+            self.max_concurrency, self.concurrency_limit + self.increase / self.concurrency_limit
+        )
+        await self._release()
+
+    async def _release_throttled(self, retry_after: Optional[float]) -> float:
+        """Shrink the limit and pause new calls; returns the pause length."""
+        self.throttled += 1
+        self._consecutive_throttles += 1
+        self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * self.decrease_factor)
+
+        if retry_after is None:
+            backoff = self.backoff_base * 2 ** (self._consecutive_throttles - 1)
+            # Jitter keeps concurrent callers from retrying in lockstep
+            retry_after = min(self.backoff_max, backoff) * random.uniform(0.5, 1.0)
+        self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+        await self._release()
+        return retry_after
+
+
+_shared: Optional[AdaptiveLimiter] = None
+
+
+def shared_limiter() -> AdaptiveLimiter:
+    """The process-wide limiter (created with defaults on first use)."""
+    global _shared
+    if _shared is None:
+        _shared = AdaptiveLimiter()
+    return _shared
+
+
+def configure_shared_limiter(**kwargs) -> AdaptiveLimiter:
+    """Replace the process-wide limiter with one built from ``kwargs``."""
+    global _shared
+    _shared = AdaptiveLimiter(**kwargs)
+    return _shared
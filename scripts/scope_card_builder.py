@@ -10,6 +10,7 @@ Guides the user through creating a comprehensive scope card that defines:
 - Success criteria
 """
 
+import copy
 import json
 import logging
 from typing import Dict, List, Optional, Tuple
@@ -32,7 +33,7 @@ class ScopeCardBuilder:
 
     def __init__(self):
         """Initialize the builder."""
-        self.scope_card = self.TEMPLATE.copy()
+        self.scope_card = copy.deepcopy(self.TEMPLATE)
 
     async def build(self, user_request: str, interactive: bool = True) -> Dict:
         """
@@ -47,6 +48,10 @@ class ScopeCardBuilder:
         """
         logger.info(f"Building scope card for: {user_request}")
 
+        # Start from a fresh card so a shared builder never hands the same
+        # dict to two callers (e.g. concurrent batch generation)
+        self.scope_card = copy.deepcopy(self.TEMPLATE)
+
         if interactive:
             return await self._build_interactive(user_request)
         else:
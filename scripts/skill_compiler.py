@@ -10,13 +10,24 @@ Compilation rules:
 1. Compliance/org hard constraints > user preference > external best practices
 2. Explicit conflict resolution with trade-offs noted
 3. Progressive disclosure: SKILL.md < 500 lines, details in references/
+
+Rendered sections are cached per compiler together with a snapshot of
+exactly the inputs each section reads (see SECTION_INPUTS), so recompiling
+after a small edit re-renders only the affected sections. Fragments that
+depend only on the overlay (see OVERLAY_FRAGMENTS) can be built once and
+shared by every skill compiled for the same organization (compile_many).
 """
 
+import hashlib
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
 from dataclasses import dataclass
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +40,211 @@ class CompilationContext:
     overlay: Dict
     conflicts: List[Dict] = None
     decisions: List[Dict] = None
+    # Overlay-only fragments by name, built on first use or precomputed
+    fragments: Dict[str, str] = None
 
     def __post_init__(self):
         if self.conflicts is None:
             self.conflicts = []
         if self.decisions is None:
             self.decisions = []
+        if self.fragments is None:
+            self.fragments = {}
+
+
+# Three or more newlines in a row: more than one blank line
+BLANK_LINES = re.compile(r"\n\n\n+")
+
+
+class SkillWriter:
+    """
+    Append-only SKILL.md buffer that drops extra blank lines as it writes.
+
+    Output never has more than one blank line in a row, including across
+    writes, so no whole-document cleanup pass is needed afterwards.
+    Fragments are joined once, by ``getvalue``; with a ``stream`` they are
+    written straight through instead, counting lines and bytes and hashing
+    them on the way (see ``summary``).
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self._parts: List[str] = []
+        # Newlines at the end of the output so far (at most 2)
+        self._trailing = 0
+
+        self.stream = stream
+        self.newlines = 0
+        self.bytes = 0
+        self._digest = hashlib.sha256()
+        self._emit = self._parts.append if stream is None else self._write_through
+
+    def write(self, text: str) -> None:
+        """Append ``text``, dropping newlines that would start a second blank line."""
+        if text == "\n":
+            # Line break between sections (the most common write)
+            if self._trailing < 2:
+                self._emit(text)
+                self._trailing += 1
+            return
+        # Searching from the first newline skips long single-line text (tool
+        # lists) cheaply; only text with a newline can start a blank-line run
+        first = text.find("\n")
+        if first == -1:
+            if text:
+                self._emit(text)
+                self._trailing = 0
+            return
+        if first == 0:
+            body = text.lstrip("\n")
+            keep = min(len(text) - len(body), 2 - self._trailing)
+            if not body:
+                if keep:
+                    self._emit("\n" * keep)
+                    self._trailing += keep
+                return
+            text = "\n" * keep + body
+        if text.find("\n\n\n", first) != -1:
+            text = BLANK_LINES.sub("\n\n", text)
+        self._emit(text)
+        self._trailing = 2 if text.endswith("\n\n") else 1 if text.endswith("\n") else 0
+
+    def write_collapsed(self, text: str) -> None:
+        """
+        Append ``text`` that has no blank-line runs of its own.
+
+        For text that went through a SkillWriter already (rendered sections,
+        overlay fragments): only its leading newlines need checking, so long
+        text isn't scanned again.
+        """
+        if not text:
+            return
+        if text[0] == "\n":
+            self.write(text)
+            return
+        self._emit(text)
+        self._trailing = 2 if text.endswith("\n\n") else 1 if text.endswith("\n") else 0
+
+    def getvalue(self) -> str:
+        """The output so far, as one string (in-memory writers only)."""
+        return "".join(self._parts)
+
+    def summary(self) -> Dict[str, Any]:
+        """Line count, UTF-8 size and SHA-256 of what was streamed."""
+        return {"lines": self.newlines + 1, "bytes": self.bytes, "sha256": self._digest.hexdigest()}
+
+    def _write_through(self, text: str) -> None:
+        self.stream.write(text)
+        data = text.encode("utf-8")
+        self.newlines += text.count("\n")
+        self.bytes += len(data)
+        self._digest.update(data)
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Regex alternation of ``words`` factored into a prefix trie.
+
+    A flat ``a|b|c...`` alternation retries every tool name at every
+    position; the trie form tries each character once per branch, so the
+    scan stays fast with hundreds of names.
+    """
+    trie: Dict[str, Dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return build(trie)
+
+
+class ToolIndex:
+    """Single-pass matcher for required/forbidden tool names and their aliases."""
+
+    def __init__(self, required: Tuple[str, ...], forbidden: Tuple[str, ...],
+                 aliases: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()):
+        """
+        Build the matcher.
+
+        Args:
+            required: Required tool names
+            forbidden: Forbidden tool names (win over required ones)
+            aliases: (tool, alias names) pairs; aliases of tools in neither
+                list are ignored
+        """
+        # lowercased name or alias -> (tool, "required" | "forbidden")
+        self.names: Dict[str, Tuple[str, str]] = {}
+        for role, tools in (("required", required), ("forbidden", forbidden)):
+            for tool in tools:
+                if tool and tool.strip():
+                    self.names[tool.strip().lower()] = (tool, role)
+        for tool, names in aliases:
+            entry = self.names.get(tool.strip().lower())
+            if entry is not None:
+                for alias in names:
+                    if alias and alias.strip():
+                        self.names.setdefault(alias.strip().lower(), entry)
+
+        # Names are whole tokens: "tool-1" doesn't match inside "tool-10" or
+        # "my-tool-1", but may be followed by punctuation. The start is checked
+        # by hand (see scan): a leading lookbehind would keep the regex engine
+        # from skipping ahead to possible first characters, and matching
+        # lowercased text avoids the slower IGNORECASE mode.
+        self.pattern = (
+            re.compile("(?:" + _trie_pattern(list(self.names)) + r")(?![\w-])") if self.names else None
+        )
+
+    def scan(self, texts: List[str]) -> Iterator[Tuple[int, str, str, str]]:
+        """
+        Yield (text index, tool, role, matched text) for each tool mention.
+
+        All texts are searched in one pass over their concatenation.
+        """
+        if self.pattern is None or not texts:
+            return
+        joined = "\n".join(texts)
+        lowered = joined.lower()
+        if len(lowered) != len(joined):
+            # Some character lowercases to several (e.g. "İ"): keep those
+            # as they are so offsets still line up
+            lowered = "".join(char.lower() if len(char.lower()) == 1 else char for char in joined)
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        search = self.pattern.search
+        pos = 0
+        while True:
+            match = search(lowered, pos)
+            if match is None:
+                return
+            start = match.start()
+            if start and (lowered[start - 1].isalnum() or lowered[start - 1] in "_-"):
+                # Inside a longer token; a shorter name may still start later
+                pos = start + 1
+                continue
+            tool, role = self.names[match.group()]
+            yield bisect_right(starts, start) - 1, tool, role, joined[start:match.end()]
+            pos = match.end()
+
+
+@lru_cache(maxsize=32)
+def tool_index(required: Tuple[str, ...], forbidden: Tuple[str, ...],
+               aliases: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()) -> ToolIndex:
+    """Shared ToolIndex for an overlay's tool lists (built once per distinct lists)."""
+    return ToolIndex(required, forbidden, aliases)
 
 
 class SkillCompiler:
@@ -54,7 +264,113 @@ class SkillCompiler:
         "canon",  # 3. External best practices
     ]
 
-    def compile(self, scope_card: Dict, canon: Dict, overlay: Dict) -> str:
+    # Body sections, in SKILL.md order
+    SECTION_ORDER = [
+        "description",
+        "when_to_use",
+        "quickstart",
+        "workflow",
+        "guardrails",
+        "templates",
+        "failure_modes",
+        "edge_cases",
+        "references",
+    ]
+
+    # Inputs each _compile_<section> reads, as (source, key, limit) with
+    # source one of scope_card/canon/overlay and limit the number of list
+    # items used (None = all). A builder that starts reading another input
+    # must be listed here, or its cached section goes stale.
+    SECTION_INPUTS = {
+        "frontmatter": (
+            ("scope_card", "goal", None),
+            ("scope_card", "trigger_words", 3),
+            ("overlay", "required_tools", 2),
+        ),
+        "description": (
+            ("scope_card", "goal", None),
+            ("scope_card", "must_cover", 3),
+            ("scope_card", "trigger_words", 3),
+            ("scope_card", "must_not_cover", 2),
+        ),
+        "when_to_use": (
+            ("overlay", "required_tools", None),
+            ("overlay", "forbidden_tools", None),
+            ("overlay", "priority", None),
+        ),
+        "quickstart": (
+            ("canon", "quickstart", None),
+        ),
+        "workflow": (
+            ("canon", "decision_points", 5),
+            ("overlay", "output_format", None),
+        ),
+        "guardrails": (
+            ("scope_card", "must_cover", 3),
+            ("scope_card", "must_not_cover", 3),
+            ("overlay", "compliance_constraints", None),
+        ),
+        "templates": (
+            ("canon", "templates", 5),
+        ),
+        "failure_modes": (
+            ("canon", "failure_modes", 5),
+            ("overlay", "failure_history", 3),
+        ),
+        "edge_cases": (
+            ("canon", "edge_cases", 5),
+            ("scope_card", "must_not_cover", 3),
+        ),
+        "references": (),
+    }
+
+    # Fragments built from the overlay alone, each by _fragment_<name>
+    OVERLAY_FRAGMENTS = ("uses", "when_to_use", "output_format", "compliance", "failure_history")
+
+    PRIORITY_TEXT = {
+        "speed": "Speed is most important - get fast results even if imperfect",
+        "accuracy": "Accuracy is critical - must be verified and precise",
+        "explainability": "Explainability matters - must be transparent and clear",
+        "consistency": "Consistency is key - must produce uniform results",
+    }
+
+    REFERENCES_SECTION = """## References & More Information
+
+For detailed information, see:
+- `references/user_overrides.md` - Organization-specific constraints and preferences
+- `references/templates.md` - Template library and variations
+- `references/examples.md` - Success stories and case studies
+- `references/best_practices.md` - Best practices and gotchas
+
+### Conflict Resolution
+
+This skill resolves conflicts between external best practices and local constraints:
+1. **Compliance/Org requirements** (highest priority) - never violated
+2. **User preferences** - followed unless conflict with compliance
+3. **External best practices** (lowest priority) - used as defaults
+
+See `references/decisions.md` for detailed resolution notes.
+"""
+
+    def __init__(self, incremental: bool = True):
+        """
+        Initialize the compiler.
+
+        Args:
+            incremental: Reuse a section rendered by an earlier compile when
+                the inputs it reads are unchanged
+        """
+        self.incremental = incremental
+        # section -> (input snapshot, rendered text), last rendering only
+        self._sections: Dict[str, Tuple[list, str]] = {}
+        # SKILL.md assembled by the last incremental compile
+        self._assembled: Optional[str] = None
+
+        self.sections_rendered = 0
+        self.sections_reused = 0
+
+    def compile(self, scope_card: Dict, canon: Dict, overlay: Dict,
+                fragments: Optional[Dict[str, str]] = None) -> str:
         """
         Main compilation entry point.
 
@@ -62,50 +378,272 @@ class SkillCompiler:
             scope_card: Step 1 output (scope definition)
             canon: Step 3 output (external knowledge)
             overlay: Step 5 output (user constraints)
+            fragments: ``overlay_fragments(overlay)``, to reuse across
+                compiles with the same overlay
 
         Returns:
             Compiled SKILL.md content (string)
         """
         logger.info("Starting skill compilation...")
 
-        ctx = CompilationContext(scope_card, canon, overlay)
+        ctx = CompilationContext(scope_card, canon, overlay, fragments=dict(fragments) if fragments else None)
+        out = SkillWriter()
 
-        # Build frontmatter
-        frontmatter = self._compile_frontmatter(ctx)
-
-        # Build body sections
-        sections = {
-            "description": self._compile_description(ctx),
-            "when_to_use": self._compile_when_to_use(ctx),
-            "quickstart": self._compile_quickstart(ctx),
-            "workflow": self._compile_workflow(ctx),
-            "guardrails": self._compile_guardrails(ctx),
-            "templates": self._compile_templates(ctx),
-            "failure_modes": self._compile_failure_modes(ctx),
-            "edge_cases": self._compile_edge_cases(ctx),
-            "references": self._compile_references(ctx),
-        }
+        unchanged = self._write_skill_md(ctx, out)
+        if unchanged is not None:
+            return unchanged
+
+        skill_md = out.getvalue()
+        if self.incremental:
+            self._assembled = skill_md
 
         # Check size and warn if needed
-        skill_md = self._assemble_skill_md(frontmatter, sections)
-        line_count = len(skill_md.split("\n"))
+        self._check_length(skill_md.count("\n") + 1)
+
+        return skill_md
+
+    def compile_many(self, scope_cards: List[Dict], canons: List[Dict], overlay: Dict,
+                     processes: int = 0, chunksize: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Compile a batch of skills that share one overlay (one organization).
+
+        The overlay-only fragments (When-to-Use tool lists, priority text,
+        compliance, output format, failure history) are built once for the
+        whole batch instead of once per skill.
+
+        Args:
+            scope_cards: Step 1 output for each skill
+            canons: Step 3 output for each skill (same order)
+            overlay: Step 5 output shared by the batch
+            processes: Compile over a process pool of this many workers
+                (0 = in this process); each worker receives the overlay and
+                fragments once
+            chunksize: Skills per pool task (default: about 4 tasks per worker)
+
+        Returns:
+            Dict with ``skill_mds`` (in input order), ``per_skill`` timings
+            (``seconds``, ``lines``, ``bytes``) and aggregate throughput
+            (``skills_per_second``, ``bytes_per_second``, ``total_seconds``,
+            ``precompute_seconds``)
+
+        Raises:
+            ValueError: If scope_cards and canons differ in length
+        """
+        if len(scope_cards) != len(canons):
+            raise ValueError(f"Got {len(scope_cards)} scope cards but {len(canons)} canons")
+
+        logger.info(f"Compiling {len(scope_cards)} skills with one overlay...")
+
+        started = time.perf_counter()
+        fragments = self.overlay_fragments(overlay)
+        precompute_seconds = time.perf_counter() - started
+
+        if processes and len(scope_cards) > 1:
+            if chunksize is None:
+                chunksize = max(1, len(scope_cards) // (processes * 4))
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_batch_worker,
+                initargs=(overlay, fragments, self.incremental),
+            ) as pool:
+                results = list(pool.map(_compile_batch_item, zip(scope_cards, canons), chunksize=chunksize))
+        else:
+            results = [
+                self._compile_timed(scope_card, canon, overlay, fragments)
+                for scope_card, canon in zip(scope_cards, canons)
+            ]
+
+        total_seconds = time.perf_counter() - started
+        skill_mds = [skill_md for skill_md, _ in results]
+        per_skill = [
+            {"seconds": round(seconds, 6), "lines": skill_md.count("\n") + 1, "bytes": len(skill_md.encode("utf-8"))}
+            for skill_md, seconds in results
+        ]
+        total_bytes = sum(item["bytes"] for item in per_skill)
+
+        return {
+            "skill_mds": skill_mds,
+            "per_skill": per_skill,
+            "skills": len(skill_mds),
+            "processes": processes,
+            "precompute_seconds": round(precompute_seconds, 6),
+            "total_seconds": round(total_seconds, 6),
+            "skills_per_second": round(len(skill_mds) / total_seconds, 1) if total_seconds else 0.0,
+            "bytes_per_second": round(total_bytes / total_seconds) if total_seconds else 0,
+        }
+
+    def _compile_timed(self, scope_card: Dict, canon: Dict, overlay: Dict,
+                       fragments: Dict[str, str]) -> Tuple[str, float]:
+        """Compile one skill of a batch; returns (SKILL.md, seconds)."""
+        started = time.perf_counter()
+        skill_md = self.compile(scope_card, canon, overlay, fragments)
+        return skill_md, time.perf_counter() - started
+
+    def compile_to(self, scope_card: Dict, canon: Dict, overlay: Dict, stream: TextIO) -> Dict[str, Any]:
+        """
+        Compile SKILL.md straight into a text stream (file, socket adapter, ...).
+
+        Sections are written as they are rendered (or reused), so the whole
+        document is never held in memory as one string.
 
+        Args:
+            scope_card: Step 1 output (scope definition)
+            canon: Step 3 output (external knowledge)
+            overlay: Step 5 output (user constraints)
+            stream: Anything with a ``write(str)`` method
+
+        Returns:
+            Summary with ``lines``, ``bytes`` (UTF-8) and ``sha256`` of the
+            written document
+        """
+        logger.info("Starting skill compilation (streamed)...")
+
+        ctx = CompilationContext(scope_card, canon, overlay)
+        out = SkillWriter(stream)
+
+        unchanged = self._write_skill_md(ctx, out)
+        if unchanged is not None:
+            out.write(unchanged)
+
+        summary = out.summary()
+        self._check_length(summary["lines"])
+        return summary
+
+    def _write_skill_md(self, ctx: CompilationContext, out: "SkillWriter") -> Optional[str]:
+        """
+        Write the frontmatter and sections into ``out``.
+
+        Returns:
+            The last assembled SKILL.md, without writing anything, when every
+            section was reused; otherwise None
+        """
+        if not self.incremental:
+            # Every section renders straight into the one document buffer
+            self._compile_frontmatter(ctx, out)
+            for name in self.SECTION_ORDER:
+                out.write("\n")
+                getattr(self, f"_compile_{name}")(ctx, out)
+            return None
+
+        rendered = self.sections_rendered
+        texts = [self._render_section(name, ctx) for name in ["frontmatter"] + self.SECTION_ORDER]
+
+        # Every section reused: the last assembly still applies
+        if self.sections_rendered == rendered and self._assembled is not None:
+            return self._assembled
+
+        # Streamed compiles don't assemble a string, so drop the stale one
+        self._assembled = None
+        self._write_sections(out, texts)
+        return None
+
+    def _check_length(self, line_count: int) -> None:
         if line_count > 500:
             logger.warning(f"SKILL.md is {line_count} lines (target: <500). Consider moving content to references/")
 
-        return skill_md
+    def cache_stats(self) -> Dict[str, int]:
+        """Counts of sections rendered and reused by incremental compiles."""
+        return {"sections_rendered": self.sections_rendered, "sections_reused": self.sections_reused}
+
+    def _section_inputs(self, name: str, ctx: CompilationContext) -> list:
+        """
+        Snapshot of the inputs section ``name`` reads (see SECTION_INPUTS).
+
+        Lists and dicts are copied two levels deep (lists of strings or flat
+        dicts, flat dicts), enough that editing the inputs in place doesn't
+        alter the snapshot. Comparing snapshots is cheaper than hashing them,
+        which would cost more than rendering most sections.
+        """
+        values = []
+        for source, key, limit in self.SECTION_INPUTS[name]:
+            value = getattr(ctx, source).get(key)
+            if isinstance(value, list):
+                value = value[:limit]
+                if value and isinstance(value[0], dict):
+                    value = [dict(item) for item in value]
+            elif isinstance(value, dict):
+                value = dict(value)
+            values.append(value)
+        return values
+
+    def _render_section(self, name: str, ctx: CompilationContext) -> str:
+        """Render one section, or reuse the last rendering if its inputs are unchanged."""
+        inputs = self._section_inputs(name, ctx)
+        cached = self._sections.get(name)
+        if cached is not None and cached[0] == inputs:
+            self.sections_reused += 1
+            return cached[1]
+        out = SkillWriter()
+        getattr(self, f"_compile_{name}")(ctx, out)
+        text = out.getvalue()
+        self._sections[name] = (inputs, text)
+        self.sections_rendered += 1
+        return text
+
+    def overlay_fragments(self, overlay: Dict) -> Dict[str, str]:
+        """Every overlay-only fragment (see OVERLAY_FRAGMENTS), for reuse across compiles."""
+        return {name: getattr(self, f"_fragment_{name}")(overlay) for name in self.OVERLAY_FRAGMENTS}
+
+    def _fragment(self, ctx: CompilationContext, name: str) -> str:
+        """Overlay-only fragment ``name``, built on first use in this compile."""
+        text = ctx.fragments.get(name)
+        if text is None:
+            text = ctx.fragments[name] = getattr(self, f"_fragment_{name}")(ctx.overlay)
+        return text
+
+    def _fragment_uses(self, overlay: Dict) -> str:
+        """Tool mention for the frontmatter description."""
+        if overlay.get("required_tools"):
+            return f" Uses: {', '.join(overlay['required_tools'][:2])}."
+        return ""
 
-    def _compile_frontmatter(self, ctx: CompilationContext) -> str:
+    def _fragment_when_to_use(self, overlay: Dict) -> str:
+        """The whole 'When to Use' section, with blank-line runs collapsed."""
+        out = SkillWriter()
+
+        # Separate writes: each long tool list is then scanned for blank
+        # lines only from its first (final) newline
+        out.write("## When to Use This Skill\n\n")
+
+        if overlay.get("required_tools"):
+            out.write(f"**Required Tools**: {', '.join(overlay['required_tools'])}\n\n")
+
+        if overlay.get("forbidden_tools"):
+            out.write(f"**Cannot Use**: {', '.join(overlay['forbidden_tools'])}\n\n")
+
+        if overlay.get("priority"):
+            out.write(f"**Priority**: {self.PRIORITY_TEXT.get(overlay['priority'], 'Balanced')}\n\n")
+
+        return out.getvalue()
+
+    def _fragment_output_format(self, overlay: Dict) -> str:
+        """Required output format block of the Workflow section."""
+        fmt = overlay.get("output_format")
+        if not fmt:
+            return ""
+        fields = "".join([f"- **{key}**: {value}\n" for key, value in fmt.items()]) if isinstance(fmt, dict) else ""
+        return f"\n### Required Output Format\n\n{fields}"
+
+    def _fragment_compliance(self, overlay: Dict) -> str:
+        """Compliance block of the Guardrails section."""
+        if overlay.get("compliance_constraints"):
+            return f"### Compliance Requirements\n\n{overlay['compliance_constraints']}\n\n"
+        return ""
+
+    def _fragment_failure_history(self, overlay: Dict) -> str:
+        """Organization failure history block of the Failure Modes section."""
+        if overlay.get("failure_history"):
+            failures = "".join([f"- {failure}\n" for failure in overlay["failure_history"][:3]])
+            return f"### Common Failures in Your Context\n\n{failures}\n"
+        return ""
+
+    def _compile_frontmatter(self, ctx: CompilationContext, out: "SkillWriter") -> None:
         """Compile YAML frontmatter."""
         scope = ctx.scope_card
         name = self._sanitize_skill_name(scope.get("goal", "unnamed_skill"))
         description = self._compile_description_short(ctx)
 
-        return f"""---
-name: {name}
-description: {description}
----
-"""
+        out.write(f"---\nname: {name}\ndescription: {description}\n---\n")
 
     def _sanitize_skill_name(self, text: str) -> str:
         """Convert skill goal to safe skill name."""
@@ -125,55 +663,29 @@ description: {description}
 
         description = f"{goal}. "
         description += f"Triggers: {', '.join(triggers[:3])}."
-
-        if ctx.overlay.get("required_tools"):
-            description += f" Uses: {', '.join(ctx.overlay['required_tools'][:2])}."
+        description += self._fragment(ctx, "uses")
 
         return description[:200]  # Max 200 chars
 
-    def _compile_description(self, ctx: CompilationContext) -> str:
+    def _compile_description(self, ctx: CompilationContext, out: "SkillWriter") -> None:
         """Compile full description section."""
         scope = ctx.scope_card
 
-        return f"""## Overview
-
-**Purpose**: {scope.get('goal', 'Unknown')}
-
-**What this skill does**:
-- {chr(10).join(f"- {item}" for item in scope.get('must_cover', [])[:3])}
-
-**When to use this**:
-- {chr(10).join(f"- {trigger}" for trigger in scope.get('trigger_words', [])[:3])}
-
-**What this skill does NOT do**:
-- {chr(10).join(f"- {item}" for item in scope.get('must_not_cover', [])[:2])}
-"""
-
-    def _compile_when_to_use(self, ctx: CompilationContext) -> str:
+        does = "\n".join([f"- {item}" for item in scope.get("must_cover", [])[:3]])
+        triggers = "\n".join([f"- {trigger}" for trigger in scope.get("trigger_words", [])[:3]])
+        does_not = "\n".join([f"- {item}" for item in scope.get("must_not_cover", [])[:2]])
+        out.write(
+            f"## Overview\n\n**Purpose**: {scope.get('goal', 'Unknown')}\n\n"
+            f"**What this skill does**:\n- {does}\n\n"
+            f"**When to use this**:\n- {triggers}\n\n"
+            f"**What this skill does NOT do**:\n- {does_not}\n"
+        )
+
+    def _compile_when_to_use(self, ctx: CompilationContext, out: "SkillWriter") -> None:
         """Compile 'When to Use' section."""
-        overlay = ctx.overlay
-        scope = ctx.scope_card
-
-        section = "## When to Use This Skill\n\n"
-
-        if overlay.get("required_tools"):
-            section += f"**Required Tools**: {', '.join(overlay['required_tools'])}\n\n"
+        out.write_collapsed(self._fragment(ctx, "when_to_use"))
 
-        if overlay.get("forbidden_tools"):
-            section += f"**Cannot Use**: {', '.join(overlay['forbidden_tools'])}\n\n"
-
-        if overlay.get("priority"):
-            priorities = {
-                "speed": "Speed is most important - get fast results even if imperfect",
-                "accuracy": "Accuracy is critical - must be verified and precise",
-                "explainability": "Explainability matters - must be transparent and clear",
-                "consistency": "Consistency is key - must produce uniform results",
-            }
-            section += f"**Priority**: {priorities.get(overlay['priority'], 'Balanced')}\n\n"
-
-        return section
-
-    def _compile_quickstart(self, ctx: CompilationContext) -> str:
+    def _compile_quickstart(self, ctx: CompilationContext, out: "SkillWriter") -> None:
         """Compile Quickstart section (max 3 steps)."""
         canon = ctx.canon
         quickstart = canon.get("quickstart", "")
@@ -181,196 +693,197 @@ description: {description}
         # Parse or generate 3-step quickstart
         steps = quickstart.split("\n")[:3] if quickstart else ["Step 1: Start", "Step 2: Configure", "Step 3: Execute"]
 
-        section = "## Quick Start\n\n"
-        for i, step in enumerate(steps, 1):
-            section += f"{i}. {step.strip()}\n"
+        numbered = "".join([f"{i}. {step.strip()}\n" for i, step in enumerate(steps, 1)])
+        out.write(f"## Quick Start\n\n{numbered}\n")
 
-        return section + "\n"
-
-    def _compile_workflow(self, ctx: CompilationContext) -> str:
+    def _compile_workflow(self, ctx: CompilationContext, out: "SkillWriter") -> None:
         """Compile Workflow section with decision points."""
         canon = ctx.canon
         decision_points = canon.get("decision_points", [])
-        overlay = ctx.overlay
-
-        section = "## Workflow\n\n"
 
         if decision_points:
-            section += "### Decision Points\n\n"
-            for point in decision_points[:5]:  # Limit to 5 decision points
-                section += f"- {point}\n"
+            # Limit to 5 decision points
+            points = "".join([f"- {point}\n" for point in decision_points[:5]])
+            steps = f"### Decision Points\n\n{points}"
         else:
-            section += "### Default Workflow\n\n"
-            section += "1. Analyze input\n"
-            section += "2. Choose approach based on context\n"
-            section += "3. Execute\n"
-
-        if overlay.get("output_format"):
-            section += f"\n### Required Output Format\n\n"
-            fmt = overlay["output_format"]
-            if isinstance(fmt, dict):
-                for key, value in fmt.items():
-                    section += f"- **{key}**: {value}\n"
+            steps = "### Default Workflow\n\n1. Analyze input\n2. Choose approach based on context\n3. Execute\n"
 
-        return section + "\n"
+        output_format = self._fragment(ctx, "output_format")
+        out.write(f"## Workflow\n\n{steps}{output_format}\n")
 
-    def _compile_guardrails(self, ctx: CompilationContext) -> str:
+    def _compile_guardrails(self, ctx: CompilationContext, out: "SkillWriter") -> None:
         """Compile Guardrails section (self-freedom constraints)."""
         scope = ctx.scope_card
-        overlay = ctx.overlay
-
-        section = "## Guardrails\n\n"
-
-        section += "### What This Can Do\n"
-        section += f"{chr(10).join(f'- {item}' for item in scope.get('must_cover', [])[:3])}\n\n"
 
-        section += "### What This Cannot Do\n"
-        section += f"{chr(10).join(f'- {item}' for item in scope.get('must_not_cover', [])[:3])}\n\n"
+        can = "\n".join([f"- {item}" for item in scope.get("must_cover", [])[:3]])
+        cannot = "\n".join([f"- {item}" for item in scope.get("must_not_cover", [])[:3]])
 
-        if overlay.get("compliance_constraints"):
-            section += f"### Compliance Requirements\n\n"
-            section += f"{overlay['compliance_constraints']}\n\n"
-
-        return section
+        compliance = self._fragment(ctx, "compliance")
+        out.write(f"## Guardrails\n\n### What This Can Do\n{can}\n\n### What This Cannot Do\n{cannot}\n\n{compliance}")
 
-    def _compile_templates(self, ctx: CompilationContext) -> str:
+    def _compile_templates(self, ctx: CompilationContext, out: "SkillWriter") -> None:
         """Compile Templates section (≥2 templates)."""
         canon = ctx.canon
         templates = canon.get("templates", [])
 
-        section = "## Templates / Examples\n\n"
-
         if templates:
-            for template in templates[:5]:  # Max 5 templates
-                name = template.get("name", "Template")
-                content = template.get("content", "")
-                section += f"### {name}\n\n```\n{content}\n```\n\n"
+            examples = "".join([
+                f"### {template.get('name', 'Template')}\n\n```\n{template.get('content', '')}\n```\n\n"
+                for template in templates[:5]  # Max 5 templates
+            ])
         else:
-            section += "### Default Template\n\n```\n[Template content will be added]\n```\n\n"
+            examples = "### Default Template\n\n```\n[Template content will be added]\n```\n\n"
+        out.write(f"## Templates / Examples\n\n{examples}")
 
-        return section
-
-    def _compile_failure_modes(self, ctx: CompilationContext) -> str:
+    def _compile_failure_modes(self, ctx: CompilationContext, out: "SkillWriter") -> None:
         """Compile Failure Modes section (≥5 modes)."""
         canon = ctx.canon
         failure_modes = canon.get("failure_modes", [])
-        overlay = ctx.overlay
-
-        section = "## Failure Modes & Fixes\n\n"
 
         # From canon
         if failure_modes:
-            for mode in failure_modes[:5]:
-                symptom = mode.get("symptom", "Unknown")
-                fix = mode.get("fix", "Unknown")
-                section += f"**Symptom**: {symptom}\n"
-                section += f"**Fix**: {fix}\n\n"
+            modes = "".join([
+                f"**Symptom**: {mode.get('symptom', 'Unknown')}\n**Fix**: {mode.get('fix', 'Unknown')}\n\n"
+                for mode in failure_modes[:5]
+            ])
         else:
-            section += "- **Symptom**: Expected behavior not achieved\n"
-            section += "  **Fix**: Check inputs and prerequisites\n\n"
+            modes = "- **Symptom**: Expected behavior not achieved\n  **Fix**: Check inputs and prerequisites\n\n"
 
         # Add failure history from overlay
-        if overlay.get("failure_history"):
-            section += "### Common Failures in Your Context\n\n"
-            for failure in overlay["failure_history"][:3]:
-                section += f"- {failure}\n"
-            section += "\n"
+        history = self._fragment(ctx, "failure_history")
 
-        return section
+        out.write(f"## Failure Modes & Fixes\n\n{modes}{history}")
 
-    def _compile_edge_cases(self, ctx: CompilationContext) -> str:
+    def _compile_edge_cases(self, ctx: CompilationContext, out: "SkillWriter") -> None:
         """Compile Edge Cases section (≥3 cases)."""
         canon = ctx.canon
         edge_cases = canon.get("edge_cases", [])
         scope = ctx.scope_card
 
-        section = "## Edge Cases\n\n"
-
         if edge_cases:
-            for case in edge_cases[:5]:
-                section += f"- {case}\n"
+            cases = "".join([f"- {case}\n" for case in edge_cases[:5]])
         else:
-            section += "- Empty input\n"
-            section += "- Boundary conditions\n"
-            section += "- Unusual combinations\n"
+            cases = "- Empty input\n- Boundary conditions\n- Unusual combinations\n"
 
         # Add from must_not_cover
+        out_of_scope = ""
         if scope.get("must_not_cover"):
-            section += "\n### Out of Scope (Related But Not Covered)\n"
-            for item in scope["must_not_cover"][:3]:
-                section += f"- {item}\n"
+            items = "".join([f"- {item}\n" for item in scope["must_not_cover"][:3]])
+            out_of_scope = f"\n### Out of Scope (Related But Not Covered)\n{items}"
 
-        return section + "\n"
+        out.write(f"## Edge Cases\n\n{cases}{out_of_scope}\n")
 
-    def _compile_references(self, ctx: CompilationContext) -> str:
+    def _compile_references(self, ctx: CompilationContext, out: "SkillWriter") -> None:
         """Compile References Navigation section."""
-        return """## References & More Information
-
-For detailed information, see:
-- `references/user_overrides.md` - Organization-specific constraints and preferences
-- `references/templates.md` - Template library and variations
-- `references/examples.md` - Success stories and case studies
-- `references/best_practices.md` - Best practices and gotchas
-
-### Conflict Resolution
-
-This skill resolves conflicts between external best practices and local constraints:
-1. **Compliance/Org requirements** (highest priority) - never violated
-2. **User preferences** - followed unless conflict with compliance
-3. **External best practices** (lowest priority) - used as defaults
-
-See `references/decisions.md` for detailed resolution notes.
-"""
-
-    def _assemble_skill_md(self, frontmatter: str, sections: Dict[str, str]) -> str:
-        """Assemble final SKILL.md from components."""
-        parts = [frontmatter]
-
-        # Add sections in order
-        section_order = [
-            "description",
-            "when_to_use",
-            "quickstart",
-            "workflow",
-            "guardrails",
-            "templates",
-            "failure_modes",
-            "edge_cases",
-            "references",
-        ]
-
-        for section_name in section_order:
-            if section_name in sections:
-                parts.append(sections[section_name])
-
-        skill_md = "\n".join(parts)
-
-        # Remove excessive blank lines
-        skill_md = re.sub(r"\n\n\n+", "\n\n", skill_md)
-
-        return skill_md
-
-    def detect_conflicts(self, scope_card: Dict, canon: Dict, overlay: Dict) -> List[Dict]:
+        out.write(self.REFERENCES_SECTION)
+
+    def _write_sections(self, out: "SkillWriter", texts: List[str]) -> None:
+        """Write rendered frontmatter and sections, in order, into ``out``."""
+        for i, text in enumerate(texts):
+            if i:
+                out.write("\n")
+            # Rendered through a SkillWriter already
+            out.write_collapsed(text)
+
+    def detect_conflicts(self, scope_card: Dict, canon: Dict, overlay: Dict,
+                         ctx: Optional[CompilationContext] = None) -> List[Dict]:
         """
         Detect conflicts between canon and overlay.
 
+        Every template, decision point and failure-mode fix is scanned once
+        with one matcher over the overlay's required and forbidden tools and
+        their aliases (``overlay["tool_aliases"]``: tool -> alias names).
+        Reported conflicts:
+        - ``forbidden_tool``: a canon item mentions a forbidden tool
+        - ``required_and_forbidden``: the overlay lists a tool as both
+        - ``required_tool_unused``: no canon item mentions a required tool
+
+        Args:
+            ctx: Compilation context to record the conflicts in
+                (``ctx.conflicts``); a new one is used if not given
+
         Returns list of conflicts with:
         - area: Which skill aspect has conflict
+        - type: Kind of conflict (see above)
+        - tool: Tool name as listed in the overlay
         - canon_says: What external best practice recommends
         - overlay_says: What user/org requires
         - resolution: How the conflict was resolved
+        (canon items also carry ``index`` and the ``matched`` text)
         """
-        conflicts = []
-
-        # Example conflicts
-        if overlay.get("required_tools") and canon.get("templates"):
-            # Check if templates use tools not in required_tools
-            for template in canon["templates"]:
-                content = template.get("content", "")
-                # Simple check - in reality would be more sophisticated
-                pass
-
-        return conflicts
+        if ctx is None:
+            ctx = CompilationContext(scope_card, canon, overlay)
+
+        required = tuple(overlay.get("required_tools") or ())
+        forbidden = tuple(overlay.get("forbidden_tools") or ())
+        if not required and not forbidden:
+            return ctx.conflicts
+        aliases = tuple(
+            (tool, tuple(names)) for tool, names in sorted((overlay.get("tool_aliases") or {}).items())
+        )
+        index = tool_index(required, forbidden, aliases)
+
+        both = {tool.strip().lower() for tool in required} & {tool.strip().lower() for tool in forbidden}
+        for tool in forbidden:
+            if tool.strip().lower() in both:
+                ctx.conflicts.append({
+                    "area": "overlay",
+                    "type": "required_and_forbidden",
+                    "tool": tool,
+                    "canon_says": None,
+                    "overlay_says": f"{tool} is both required and forbidden",
+                    "resolution": f"Forbidden wins (compliance > user preference): do not use {tool}",
+                })
+
+        alternatives = [tool for tool in required if tool.strip().lower() not in both][:3]
+        instead = f"; use {', '.join(alternatives)} instead" if alternatives else ""
+        items = self._canon_tool_texts(canon)
+        used = set()
+        reported = set()
+        for i, tool, role, matched in index.scan([text for _, _, text in items]):
+            if role == "required":
+                used.add(tool)
+            elif (i, tool) not in reported:
+                reported.add((i, tool))
+                area, position, text = items[i]
+                ctx.conflicts.append({
+                    "area": area,
+                    "index": position,
+                    "type": "forbidden_tool",
+                    "tool": tool,
+                    "matched": matched,
+                    "canon_says": text if len(text) <= 120 else text[:117] + "...",
+                    "overlay_says": f"Cannot use {tool}",
+                    "resolution": f"Compliance/org constraint wins: drop {tool}{instead}",
+                })
+
+        if items:
+            for tool in required:
+                if tool not in used and tool.strip().lower() not in both:
+                    ctx.conflicts.append({
+                        "area": "required_tools",
+                        "type": "required_tool_unused",
+                        "tool": tool,
+                        "canon_says": f"No template, decision point or fix uses {tool}",
+                        "overlay_says": f"Must use {tool}",
+                        "resolution": f"User preference wins: adapt the canon examples to {tool}",
+                    })
+
+        return ctx.conflicts
+
+    @staticmethod
+    def _canon_tool_texts(canon: Dict) -> List[Tuple[str, int, str]]:
+        """(area, index, text) of every canon item that may name a tool."""
+        items = []
+        for i, template in enumerate(canon.get("templates") or []):
+            content = template.get("content", "") if isinstance(template, dict) else template
+            items.append(("templates", i, str(content)))
+        for i, point in enumerate(canon.get("decision_points") or []):
+            items.append(("decision_points", i, str(point)))
+        for i, mode in enumerate(canon.get("failure_modes") or []):
+            if isinstance(mode, dict):
+                items.append(("failure_modes", i, str(mode.get("fix", ""))))
+        return items
 
     def validate_compilation(self, skill_md: str, scope_card: Dict) -> Tuple[bool, List[str]]:
         """
@@ -406,3 +919,21 @@ See `references/decisions.md` for detailed resolution notes.
             errors.append("Consider adding more emphasis with **bold text**")
 
         return len(errors) == 0, errors
+
+
+# Per-process state of compile_many pool workers: the overlay and its
+# fragments arrive once, through the pool initializer
+_batch_worker: Dict[str, Any] = {}
+
+
+def _init_batch_worker(overlay: Dict, fragments: Dict[str, str], incremental: bool) -> None:
+    _batch_worker["compiler"] = SkillCompiler(incremental=incremental)
+    _batch_worker["overlay"] = overlay
+    _batch_worker["fragments"] = fragments
+
+
+def _compile_batch_item(item: Tuple[Dict, Dict]) -> Tuple[str, float]:
+    scope_card, canon = item
+    return _batch_worker["compiler"]._compile_timed(
+        scope_card, canon, _batch_worker["overlay"], _batch_worker["fragments"]
+    )
@@ -10,13 +10,31 @@ Automates the 6-step SkillForge process:
 6. Skill Compilation (Step 6)
 """
 
+import asyncio
 import json
 import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict, fields, is_dataclass
 from datetime import datetime
 
+try:
+    from .artifact_store import ArtifactStore
+    from .checkpoint import CheckpointStore
+    from .disk_cache import DiskLRUCache, cache_key
+    from .pipeline import PipelineEvent, PipelineStep, StepScheduler
+    from .tracing import Tracer, span
+except ImportError:
+    from artifact_store import ArtifactStore
+    from checkpoint import CheckpointStore
+    from disk_cache import DiskLRUCache, cache_key
+    from pipeline import PipelineEvent, PipelineStep, StepScheduler
+    from tracing import Tracer, span
+
+__version__ = "1.0.0"
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,10 +89,13 @@ class ExternalCanon:
     failure_modes: List[Dict[str, str]]  # [{symptom, fix}]
     edge_cases: List[str]  # Edge case descriptions
     created_at: str = None
+    fallback_categories: List[str] = None  # Categories filled with generic fallbacks
 
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now().isoformat()
+        if self.fallback_categories is None:
+            self.fallback_categories = []
 
 
 @dataclass
@@ -86,6 +107,7 @@ class LocalOverlay:
     output_format: Optional[Dict] = None  # Fixed format requirements
     priority: str = None  # speed/accuracy/explainability/consistency
     failure_history: List[str] = None  # Common failure patterns
+    tool_aliases: Optional[Dict[str, List[str]]] = None  # Tool -> other names it goes by
     created_at: str = None
 
     def __post_init__(self):
@@ -95,20 +117,109 @@ class LocalOverlay:
             self.failure_history = []
 
 
+def _coerce(cls, value):
+    """Build a step dataclass from a sub-engine result (dict or instance)."""
+    if isinstance(value, cls):
+        return value
+    known = {f.name for f in fields(cls)}
+    return cls(**{k: v for k, v in value.items() if k in known})
+
+
+def _as_dict(value) -> Dict:
+    """Return a plain dict for a step dataclass or dict."""
+    return asdict(value) if is_dataclass(value) else dict(value)
+
+
+# Per-process compiler/validator instances for executor workers
+_worker_engines: Dict[str, object] = {}
+
+
+def _compile_in_worker(scope_card: Dict, canon: Dict, overlay: Dict) -> str:
+    """Step 6 in an executor worker; plain dicts in, SKILL.md out."""
+    if "compiler" not in _worker_engines:
+        from skill_compiler import SkillCompiler
+        _worker_engines["compiler"] = SkillCompiler()
+    return _worker_engines["compiler"].compile(scope_card, canon, overlay)
+
+
+def _validate_in_worker(skill_md: str, scope_card: Dict, canon: Dict) -> Dict:
+    """Quality gates in an executor worker; plain dicts in, report dict out."""
+    if "validator" not in _worker_engines:
+        from validators import SkillValidator
+        _worker_engines["validator"] = SkillValidator()
+    return _worker_engines["validator"].validate_skill(skill_md, scope_card, canon)
+
+
 class SkillForgeEngine:
     """
     Main orchestration engine for the 6-step SkillForge process.
     """
 
-    def __init__(self, storage_dir: str = None):
+    # Checkpointed step outputs, in pipeline order
+    STEP_ORDER = [
+        "scope_card",
+        "degrees_of_freedom",
+        "external_canon",
+        "contract",
+        "local_overlay",
+        "skill_md",
+    ]
+
+    # Events generate_skill_stream buffers before pausing the pipeline
+    STREAM_MAX_PENDING = 8
+
+    # Step outputs served from the result cache on a hit
+    CACHED_STEPS = ["external_canon", "contract", "skill_md", "validation"]
+
+    def __init__(
+        self,
+        storage_dir: str = None,
+        trace_dir: str = None,
+        result_cache: bool = False,
+        cache_max_bytes: int = 256 * 1024 * 1024,
+        cache_ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        process_workers: int = 0,
+        executor: Optional[Executor] = None,
+        notebooklm_options: Optional[Dict] = None,
+    ):
         """
         Initialize the engine.
 
         Args:
             storage_dir: Directory for storing generated artifacts
+            trace_dir: If set, write a Chrome trace-event JSON file per run here
+            result_cache: Reuse canon, compilation and validation for runs
+                with the same request, scope card, overlay and version
+            cache_max_bytes: Result cache size limit (LRU eviction)
+            cache_ttl_seconds: Result cache entry lifetime (None = no expiry)
+            process_workers: If > 0, run Step 6 and the quality gates in a
+                ProcessPoolExecutor with this many workers, so CPU-bound
+                compilation scales across cores in batch mode
+            executor: Executor to use instead (not shut down by ``close``)
+            notebooklm_options: Keyword arguments for NotebookLMIntegration,
+                e.g. {"cache_dir": ..., "max_concurrency": ...}
         """
         self.storage_dir = Path(storage_dir) if storage_dir else Path.cwd() / "skillforge_output"
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoints = CheckpointStore(self.storage_dir / "checkpoints")
+        self.artifact_store = ArtifactStore(self.storage_dir / "store")
+        self.trace_dir = Path(trace_dir) if trace_dir else None
+        self.result_cache = (
+            DiskLRUCache(self.storage_dir / "cache" / "results", cache_max_bytes, cache_ttl_seconds)
+            if result_cache else None
+        )
+        if self.trace_dir:
+            self.trace_dir.mkdir(parents=True, exist_ok=True)
+
+        # CPU-bound work (Step 6, quality gates) runs here when set
+        self._owns_executor = executor is None and process_workers > 0
+        self.executor = executor or (ProcessPoolExecutor(max_workers=process_workers) if process_workers > 0 else None)
+
+        self.notebooklm_options = {
+            # Offline canon's knowledge index is persisted next to the other outputs
+            "knowledge_index_path": str(self.storage_dir / "knowledge_index.json"),
+            **(notebooklm_options or {}),
+        }
 
         # Sub-engines (lazy loaded)
         self._scope_builder = None
@@ -130,7 +241,7 @@ class SkillForgeEngine:
         """Lazy load NotebookLM integration."""
         if self._notebooklm_integration is None:
             from notebooklm_integration import NotebookLMIntegration
-            self._notebooklm_integration = NotebookLMIntegration()
+            self._notebooklm_integration = NotebookLMIntegration(**self.notebooklm_options)
         return self._notebooklm_integration
 
     @property
@@ -169,6 +280,9 @@ class SkillForgeEngine:
         5. Collect local overlay via user interview
         6. Compile SKILL.md
 
+        Each step's output is checkpointed under the run ID as soon as it
+        completes, so a failed run can be continued with ``resume``.
+
         Args:
             user_request: User's skill request (e.g., "make a skill for X")
             interactive: Whether to prompt user for input
@@ -176,72 +290,398 @@ class SkillForgeEngine:
         Returns:
             Dict with generated skill structure and metadata
         """
-        logger.info(f"Starting skill generation for: {user_request}")
+        run_id = CheckpointStore.new_run_id()
+        self.checkpoints.start(run_id, {"user_request": user_request, "interactive": interactive})
+        return await self._run_pipeline(run_id, user_request, interactive, completed={})
+
+    async def resume(self, run_id: str) -> Dict:
+        """
+        Resume a previous run from its first missing step.
+
+        Steps whose output was checkpointed are restored instead of re-run.
+
+        Args:
+            run_id: Run ID from a previous ``generate_skill`` result
+
+        Returns:
+            Dict with generated skill structure and metadata
+
+        Raises:
+            FileNotFoundError: If no checkpoint exists for the run
+        """
+        checkpoint = self.checkpoints.load(run_id)
+        run_info = checkpoint["run"]
+        logger.info(f"Resuming run {run_id} with completed steps: {sorted(checkpoint['steps'])}")
+        return await self._run_pipeline(
+            run_id, run_info["user_request"], run_info["interactive"], completed=checkpoint["steps"]
+        )
+
+    async def generate_skill_stream(
+        self, user_request: str, interactive: bool = False
+    ) -> AsyncIterator[PipelineEvent]:
+        """
+        Generate a skill, yielding progress events as the pipeline runs.
+
+        Yields a ``run_started`` event, then ``step_started`` and
+        ``step_finished`` (carrying the step's output, e.g. the scope card or
+        canon) or ``step_failed`` for each step, and finally ``run_finished``.
+        The final event carries the result without its ``steps`` block, since
+        every step output has already been yielded; while streaming, the run
+        doesn't assemble that block at all.
+
+        At most ``STREAM_MAX_PENDING`` events are buffered: a consumer that
+        falls behind pauses the pipeline at its next event. Closing the
+        generator early cancels the run.
+
+        Args:
+            user_request: User's skill request (e.g., "make a skill for X")
+            interactive: Whether to prompt user for input
+        """
+        run_id = CheckpointStore.new_run_id()
+        self.checkpoints.start(run_id, {"user_request": user_request, "interactive": interactive})
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.STREAM_MAX_PENDING)
+
+        async def run() -> None:
+            cancelled = False
+            try:
+                await self._run_pipeline(run_id, user_request, interactive, completed={},
+                                         listener=queue.put)
+            except asyncio.CancelledError:
+                # The consumer is gone; nobody would take the end marker
+                cancelled = True
+                raise
+            finally:
+                if not cancelled:
+                    await queue.put(None)
+
+        task = asyncio.ensure_future(run())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def _run_pipeline(self, run_id: str, user_request: str, interactive: bool,
+                            completed: Dict,
+                            listener: Optional[Callable[[PipelineEvent], Awaitable[None]]] = None) -> Dict:
+        """
+        Run all steps not already present in ``completed``, reporting events to ``listener``.
+
+        Each event is awaited on ``listener`` before the run goes on. With a
+        listener the result's ``steps`` block is left empty: the listener
+        has received every step output already.
+        """
+        logger.info(f"Starting skill generation for: {user_request} (run {run_id})")
+        started = time.perf_counter()
+
+        async def emit(event_type: str, step: Optional[str] = None, data=None) -> None:
+            if listener:
+                elapsed = round(time.perf_counter() - started, 6)
+                await listener(PipelineEvent(event_type, run_id, elapsed, step, data))
 
         result = {
             "status": "generating",
+            "run_id": run_id,
             "steps": {},
+            "restored_steps": [step for step in self.STEP_ORDER if step in completed],
             "artifacts": [],
             "errors": [],
             "warnings": []
         }
 
-        try:
-            # Step 1: Scope Card
-            logger.info("Step 1: Building scope card...")
-            scope_card = await self._step1_scope_card(user_request, interactive)
-            result["steps"]["scope_card"] = asdict(scope_card)
-
-            # Step 2: Degrees of Freedom
-            logger.info("Step 2: Determining degrees of freedom...")
-            degrees_of_freedom = self._step2_degrees_of_freedom(scope_card)
-            result["steps"]["degrees_of_freedom"] = degrees_of_freedom
-
-            # Step 3: External Canon
-            logger.info("Step 3: Collecting external canon from NotebookLM...")
-            canon = await self._step3_external_canon(scope_card)
-            result["steps"]["external_canon"] = asdict(canon)
-
-            # Step 4: Contract Extraction
-            logger.info("Step 4: Extracting contract...")
-            contract = self._step4_contract_extraction(canon)
-            result["steps"]["contract"] = contract
-
-            # Step 5: Local Overlay
-            logger.info("Step 5: Collecting user constraints...")
-            overlay = await self._step5_local_overlay(scope_card, interactive)
-            result["steps"]["local_overlay"] = asdict(overlay)
-
-            # Step 6: Skill Compilation
-            logger.info("Step 6: Compiling SKILL.md...")
-            skill_md = self._step6_compilation(scope_card, canon, overlay)
-            result["steps"]["skill_md"] = skill_md
-
-            # Quality Gates
-            logger.info("Validating quality gates...")
-            validation = self.validator.validate_skill(skill_md, scope_card, canon)
-            result["validation"] = validation
-
-            if not validation["passed"]:
-                result["status"] = "failed_validation"
-                result["errors"].extend(validation["errors"])
-            else:
-                result["status"] = "success"
-
-            # Save artifacts
-            await self._save_artifacts(result)
-            logger.info(f"Skill generation completed: {result['status']}")
-
-        except Exception as e:
-            logger.error(f"Error during skill generation: {e}", exc_info=True)
-            result["status"] = "error"
-            result["errors"].append(str(e))
-
+        await emit(PipelineEvent.RUN_STARTED, data={"user_request": user_request})
+
+        values = {"user_request": user_request, "interactive": interactive}
+        values.update({step: completed[step] for step in result["restored_steps"]})
+        for step in result["restored_steps"]:
+            logger.info(f"  Restored {step} from checkpoint")
+            await emit(PipelineEvent.STEP_RESTORED, step, completed[step])
+
+        async def on_step_complete(step: str, output) -> None:
+            if step in self.STEP_ORDER:
+                self.checkpoints.save_step(run_id, step, output)
+            await emit(PipelineEvent.STEP_FINISHED, step, output)
+
+        async def on_step_start(step: str) -> None:
+            await emit(PipelineEvent.STEP_STARTED, step)
+
+        async def on_step_error(step: str, error: BaseException) -> None:
+            await emit(PipelineEvent.STEP_FAILED, step, str(error))
+
+        tracer = Tracer(name=f"skillforge {run_id}")
+        with tracer.activate():
+            try:
+                with span("generate_skill", "run", run_id=run_id):
+                    scheduler = StepScheduler(self._pipeline_steps())
+                    await scheduler.run(values, on_step_complete=on_step_complete,
+                                        on_step_start=on_step_start, on_step_error=on_step_error)
+
+                    steps = {step: values[step] for step in self.STEP_ORDER}
+                    if listener is None:
+                        result["steps"] = steps
+                    validation = values["validation"]
+                    result["validation"] = validation
+                    result["conflicts"] = values["conflicts"]
+                    if result["conflicts"]:
+                        result["warnings"].append(
+                            f"{len(result['conflicts'])} canon/overlay conflict(s) resolved; see result['conflicts']"
+                        )
+
+                    if self.result_cache:
+                        result["cache"] = self._store_cached_result(values)
+
+                    result.update(self._notebooklm_stats())
+
+                    if not validation["passed"]:
+                        result["status"] = "failed_validation"
+                        result["errors"].extend(validation["errors"])
+                    else:
+                        result["status"] = "success"
+
+                    # Save artifacts
+                    with span("save_artifacts", "io"):
+                        await self._save_artifacts(result, steps)
+                logger.info(f"Skill generation completed: {result['status']}")
+
+            except Exception as e:
+                logger.error(f"Error during skill generation: {e}", exc_info=True)
+                result["status"] = "error"
+                result["errors"].append(str(e))
+                if listener is None:
+                    result["steps"] = {step: values[step] for step in self.STEP_ORDER if step in values}
+
+        result["timings"] = self._timings(tracer, time.perf_counter() - started)
+        if self.trace_dir:
+            result["trace_file"] = tracer.export_chrome_trace(self.trace_dir / f"{run_id}.trace.json")
+
+        await emit(PipelineEvent.RUN_FINISHED, data={k: v for k, v in result.items() if k != "steps"})
         return result
 
+    def _notebooklm_stats(self) -> Dict:
+        """
+        NotebookLM cache, limiter and query stats for the result.
+
+        Empty when the integration was never created (e.g. every run so far
+        hit the result cache), so reporting doesn't construct it.
+        """
+        integration = self._notebooklm_integration
+        if integration is None:
+            return {}
+        stats = {}
+        for key, method in (
+            ("notebooklm_cache", "cache_stats"),
+            ("notebooklm_limiter", "limiter_stats"),
+            ("notebooklm_queries", "query_stats"),
+        ):
+            fn = getattr(integration, method, None)
+            value = fn() if fn else None
+            if value is not None:
+                stats[key] = value
+        return stats
+
+    def _timings(self, tracer: Tracer, total: float) -> Dict:
+        """Build the result's timings block from a run's spans."""
+        spans = tracer.summary()
+        return {
+            "total": round(total, 6),
+            "steps": {
+                s["name"]: {"start": s["start"], "end": s["end"], "duration": s["duration"]}
+                for s in spans if s["cat"] == "step"
+            },
+            "spans": spans,
+        }
+
+    def _pipeline_steps(self) -> List[PipelineStep]:
+        """
+        Declare the pipeline as a dependency graph.
+
+        Step outputs are plain dicts (the checkpoint format); the adapters
+        below convert them to the step dataclasses. Steps 3 and 5 both depend
+        only on the scope card, so canon collection overlaps the interview.
+        """
+        async def scope_card(user_request, interactive):
+            return asdict(await self._step1_scope_card(user_request, interactive))
+
+        async def external_canon(scope_card):
+            return asdict(await self._step3_external_canon(_coerce(ScopeCard, scope_card)))
+
+        async def local_overlay(scope_card, interactive):
+            return asdict(await self._step5_local_overlay(_coerce(ScopeCard, scope_card), interactive))
+
+        def degrees_of_freedom(scope_card):
+            return self._step2_degrees_of_freedom(_coerce(ScopeCard, scope_card))
+
+        def contract(external_canon):
+            return self._step4_contract_extraction(_coerce(ExternalCanon, external_canon))
+
+        async def skill_md(scope_card, external_canon, local_overlay):
+            return await self.compile_skill(scope_card, external_canon, local_overlay)
+
+        async def validation(skill_md, scope_card, external_canon):
+            return await self.validate_skill(skill_md, scope_card, external_canon)
+
+        def conflicts(scope_card, external_canon, local_overlay):
+            return self.compiler.detect_conflicts(scope_card, external_canon, local_overlay)
+
+        def cache_lookup(user_request, scope_card, local_overlay):
+            key = self._result_cache_key(user_request, scope_card, local_overlay)
+            cached = self.result_cache.get(key)
+            logger.info(f"  Result cache {'hit' if cached else 'miss'} ({key[:12]})")
+            return {"key": key, "hit": cached is not None}, cached or {}
+
+        # With the result cache on, canon collection still overlaps Step 5,
+        # but the steps reading the canon wait for the lookup: a hit cancels
+        # (or replaces) the live canon and supplies the cached outputs
+        canon_readers_after = ["cache_lookup"] if self.result_cache else []
+
+        steps = [
+            PipelineStep("scope_card", scope_card, ["user_request", "interactive"],
+                         label="Step 1: Building scope card"),
+            PipelineStep("degrees_of_freedom", degrees_of_freedom, ["scope_card"],
+                         label="Step 2: Determining degrees of freedom"),
+            PipelineStep("external_canon", external_canon, ["scope_card"],
+                         label="Step 3: Collecting external canon from NotebookLM"),
+            PipelineStep("contract", contract, ["external_canon"],
+                         label="Step 4: Extracting contract", after=canon_readers_after),
+            PipelineStep("local_overlay", local_overlay, ["scope_card", "interactive"],
+                         label="Step 5: Collecting user constraints"),
+            PipelineStep("skill_md", skill_md, ["scope_card", "external_canon", "local_overlay"],
+                         label="Step 6: Compiling SKILL.md", after=canon_readers_after),
+            PipelineStep("validation", validation, ["skill_md", "scope_card", "external_canon"],
+                         label="Validating quality gates"),
+            PipelineStep("conflicts", conflicts, ["scope_card", "external_canon", "local_overlay"],
+                         label="Detecting canon/overlay conflicts", after=canon_readers_after),
+        ]
+        if self.result_cache:
+            steps.append(PipelineStep(
+                "cache_lookup", cache_lookup, ["user_request", "scope_card", "local_overlay"],
+                label="Checking result cache", provides=self.CACHED_STEPS,
+            ))
+        return steps
+
+    def _result_cache_key(self, user_request: str, scope_card: Dict, overlay: Dict) -> str:
+        """Cache key over the normalized request, scope card, overlay and version."""
+        return cache_key(
+            " ".join(user_request.lower().split()),
+            ArtifactStore.normalize(scope_card),
+            ArtifactStore.normalize(overlay),
+            __version__,
+        )
+
+    def _store_cached_result(self, values: Dict) -> Dict:
+        """
+        Cache a finished run's outputs on a miss; report cache counters.
+
+        Degraded runs are not stored, so a transient NotebookLM failure isn't
+        served for the cache's whole TTL: runs that failed validation, or
+        whose canon came from offline mode (no notebook) or used a generic
+        fallback for any category.
+        """
+        lookup = values["cache_lookup"]
+        canon = values["external_canon"]
+        stored = (
+            not lookup["hit"]
+            and values["validation"]["passed"]
+            and bool(canon.get("notebook_id"))
+            and not canon.get("fallback_categories")
+        )
+        if stored:
+            self.result_cache.put(lookup["key"], {step: values[step] for step in self.CACHED_STEPS})
+        elif not lookup["hit"]:
+            logger.info("  Not caching degraded result")
+
+        stats = self.result_cache.stats()
+        return {
+            "hit": lookup["hit"],
+            "stored": stored,
+            "key": lookup["key"],
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+        }
+
+    async def generate_skills(
+        self,
+        requests: List[str],
+        max_concurrency: int = 4,
+        interactive: bool = False,
+    ) -> Dict:
+        """
+        Generate several skills concurrently.
+
+        Requests are fanned out on the running event loop, with at most
+        ``max_concurrency`` pipelines in flight. All pipelines share this
+        engine's sub-engines.
+
+        Args:
+            requests: User skill requests
+            max_concurrency: Maximum number of pipelines running at once
+            interactive: Whether to prompt user for input (normally False
+                for batches, since prompts would interleave)
+
+        Returns:
+            Dict with per-request results (in input order), failures and
+            aggregate throughput
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+
+        logger.info(f"Starting batch generation of {len(requests)} skills "
+                    f"(max_concurrency={max_concurrency})")
+
+        # Instantiate the sub-engines every pipeline uses up front. The
+        # NotebookLM integration stays lazy: runs served from the result
+        # cache never need it, and since the property doesn't await,
+        # concurrent pipelines still share the one instance it creates.
+        _ = (self.scope_builder, self.interviewer, self.compiler)
+        if self.executor is None:
+            _ = self.validator
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(user_request: str) -> Dict:
+            async with semaphore:
+                try:
+                    return await self.generate_skill(user_request, interactive=interactive)
+                except Exception as e:
+                    logger.error(f"Batch request failed: {user_request}: {e}", exc_info=True)
+                    return {"status": "error", "errors": [str(e)]}
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(run_one(r) for r in requests))
+        elapsed = time.perf_counter() - started
+
+        failures = [
+            {"index": i, "request": request, "status": res["status"], "errors": res.get("errors", [])}
+            for i, (request, res) in enumerate(zip(requests, results))
+            if res["status"] != "success"
+        ]
+
+        summary = {
+            "total": len(requests),
+            "succeeded": len(requests) - len(failures),
+            "failed": len(failures),
+            "elapsed_seconds": round(elapsed, 4),
+            "throughput_per_second": round(len(requests) / elapsed, 2) if elapsed > 0 else None,
+        }
+        logger.info(f"Batch generation completed: {summary}")
+
+        return {
+            "results": list(results),
+            "failures": failures,
+            "summary": summary,
+        }
+
     async def _step1_scope_card(self, user_request: str, interactive: bool) -> ScopeCard:
         """Step 1: Generate scope card."""
-        return await self.scope_builder.build(user_request, interactive=interactive)
+        card = await self.scope_builder.build(user_request, interactive=interactive)
+        return _coerce(ScopeCard, card)
 
     def _step2_degrees_of_freedom(self, scope_card: ScopeCard) -> Dict:
         """Step 2: Determine degrees of freedom based on scope card."""
@@ -292,7 +732,8 @@ class SkillForgeEngine:
 
     async def _step3_external_canon(self, scope_card: ScopeCard) -> ExternalCanon:
         """Step 3: Collect external canon from NotebookLM."""
-        return await self.notebooklm_integration.collect_canon(scope_card)
+        canon = await self.notebooklm_integration.collect_canon(_as_dict(scope_card))
+        return _coerce(ExternalCanon, canon)
 
     def _step4_contract_extraction(self, canon: ExternalCanon) -> Dict:
         """Step 4: Extract executable contract from canon."""
@@ -306,49 +747,142 @@ class SkillForgeEngine:
 
     async def _step5_local_overlay(self, scope_card: ScopeCard, interactive: bool) -> LocalOverlay:
         """Step 5: Collect local overlay (user constraints)."""
-        return await self.interviewer.interview(scope_card, interactive=interactive)
+        overlay = await self.interviewer.interview(_as_dict(scope_card), interactive=interactive)
+        return _coerce(LocalOverlay, overlay)
 
-    def _step6_compilation(self, scope_card: ScopeCard, canon: ExternalCanon, overlay: LocalOverlay) -> str:
-        """Step 6: Compile external canon + local overlay into SKILL.md."""
-        return self.compiler.compile(scope_card, canon, overlay)
+    @staticmethod
+    def _step6_inputs(scope_card: Dict, canon: Dict, overlay: Dict) -> Tuple[Dict, Dict, Dict]:
+        """
+        Normalize Step 6 inputs through the step dataclasses.
 
-    async def _save_artifacts(self, result: Dict) -> None:
-        """Save all artifacts to disk."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = self.storage_dir / f"skill_{timestamp}"
-        output_dir.mkdir(parents=True, exist_ok=True)
+        Every compile path (in-process, executor, streamed) sees the same
+        inputs: unknown keys are dropped and missing required fields raise
+        TypeError, whichever path runs.
+        """
+        return (
+            _as_dict(_coerce(ScopeCard, scope_card)),
+            _as_dict(_coerce(ExternalCanon, canon)),
+            _as_dict(_coerce(LocalOverlay, overlay)),
+        )
+
+    async def compile_skill(self, scope_card: Dict, canon: Dict, overlay: Dict) -> str:
+        """Step 6: Compile canon + overlay into SKILL.md, in the executor when one is configured."""
+        inputs = self._step6_inputs(scope_card, canon, overlay)
+        if self.executor is None:
+            return self.compiler.compile(*inputs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _compile_in_worker, *inputs)
+
+    def compile_skill_to(self, scope_card: Dict, canon: Dict, overlay: Dict, stream) -> Dict:
+        """
+        Run Step 6 straight into a text stream, in-process.
 
-        # Save JSON metadata
-        with open(output_dir / "metadata.json", "w") as f:
-            json.dump(result, f, indent=2)
+        Returns:
+            Summary with the document's ``lines``, ``bytes`` and ``sha256``
+        """
+        return self.compiler.compile_to(*self._step6_inputs(scope_card, canon, overlay), stream)
 
-        # Save SKILL.md
-        if "skill_md" in result.get("steps", {}):
-            with open(output_dir / "SKILL.md", "w") as f:
-                f.write(result["steps"]["skill_md"])
+    async def validate_skill(self, skill_md: str, scope_card: Dict, canon: Dict) -> Dict:
+        """
+        Run the quality gates, in the executor when one is configured.
 
-        logger.info(f"Artifacts saved to {output_dir}")
-        result["artifacts"].append(str(output_dir))
+        Per-gate trace spans are only recorded when the gates run in-process.
+        """
+        if self.executor is None:
+            return self.validator.validate_skill(skill_md, _as_dict(scope_card), _as_dict(canon))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, _validate_in_worker, skill_md, _as_dict(scope_card), _as_dict(canon)
+        )
+
+    def close(self) -> None:
+        """Shut down the process pool created for ``process_workers`` and NotebookLM workers."""
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        close = getattr(self._notebooklm_integration, "close", None)
+        if close is not None:
+            close()
+
+    async def _save_artifacts(self, result: Dict, steps: Dict) -> None:
+        """Save SKILL.md and metadata to the content-addressed artifact store."""
+        metadata = {
+            "steps": {k: v for k, v in steps.items() if k != "skill_md"},
+            "validation": result.get("validation"),
+            "conflicts": result.get("conflicts", []),
+        }
+
+        entry = self.artifact_store.put(
+            result["run_id"], steps.get("skill_md", ""), metadata, status=result["status"]
+        )
+
+        logger.info(f"Artifacts saved to {entry['path']}")
+        result["content_hash"] = entry["content_hash"]
+        result["artifacts"].append(entry["path"])
 
 
 # CLI Entry Point
 async def main():
     """CLI entry point for SkillForge engine."""
     import sys
-    import asyncio
-
-    if len(sys.argv) < 2:
-        print("Usage: python skillforge_engine.py <user_request>")
-        print("Example: python skillforge_engine.py 'make a skill for Python linting'")
+    import argparse
+
+    try:
+        from .skillforge_server import SkillForgeClient, SkillForgeServer
+    except ImportError:
+        from skillforge_server import SkillForgeClient, SkillForgeServer
+
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        parser = argparse.ArgumentParser(
+            prog="skillforge_engine.py serve",
+            description="Run a resident SkillForge daemon",
+        )
+        parser.add_argument("--socket", help="Unix socket path (default: $SKILLFORGE_SOCKET or <tmp>/skillforge.sock)")
+        parser.add_argument("--port", type=int, help="Serve on this localhost TCP port instead of a Unix socket")
+        parser.add_argument("--storage-dir", help="Directory for generated artifacts")
+        parser.add_argument("--workers", type=int, default=0,
+                            help="Run compilation and quality gates in this many worker processes")
+        args = parser.parse_args(sys.argv[2:])
+
+        logging.basicConfig(level=logging.INFO)
+        engine = SkillForgeEngine(args.storage_dir, process_workers=args.workers)
+        server = SkillForgeServer(engine, socket_path=args.socket, port=args.port)
+        await server.serve_forever()
+        return
+
+    parser = argparse.ArgumentParser(
+        prog="skillforge_engine.py",
+        description="Generate a skill (use 'serve' to run a resident daemon)",
+        epilog="Example: python skillforge_engine.py 'make a skill for Python linting'",
+    )
+    parser.add_argument("user_request", nargs="*", help="Skill request")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Resume a failed run from its checkpoints")
+    parser.add_argument("--socket", help="Forward the request to a running daemon on this Unix socket")
+    parser.add_argument("--port", type=int, help="Forward the request to a running daemon on this localhost port")
+    parser.add_argument("--trace-dir", help="Write a Chrome trace-event JSON file for the run to this directory")
+    args = parser.parse_args()
+
+    if not args.user_request and not args.resume:
+        parser.print_help()
         sys.exit(1)
 
-    user_request = " ".join(sys.argv[1:])
-    engine = SkillForgeEngine()
+    user_request = " ".join(args.user_request)
+
+    if args.socket or args.port:
+        # Forwarded requests run non-interactively in the daemon
+        if args.resume:
+            parser.error("--resume cannot be forwarded to a daemon")
+        client = SkillForgeClient(socket_path=args.socket, port=args.port)
+        result = await client.generate(user_request)
+    else:
+        engine = SkillForgeEngine(trace_dir=args.trace_dir)
+        if args.resume:
+            result = await engine.resume(args.resume)
+        else:
+            result = await engine.generate_skill(user_request, interactive=True)
 
-    result = await engine.generate_skill(user_request, interactive=True)
     print(json.dumps(result, indent=2))
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
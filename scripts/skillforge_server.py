@@ -0,0 +1,357 @@
+"""
+SkillForge Server - Long-lived daemon exposing the engine over a local socket
+
+Keeps one SkillForgeEngine (and its warm sub-engines, caches and NotebookLM
+session) resident, and accepts jobs from thin clients so each CLI call
+avoids interpreter, import and sub-engine startup.
+
+Protocol: newline-delimited JSON over a Unix socket (default) or a
+localhost TCP port. Each request line is
+
+    {"op": "generate" | "compile" | "compile_stream" | "validate" | "ping", "params": {...}}
+
+and is answered by one line
+
+    {"ok": true, "result": {...}}   or   {"ok": false, "error": "..."}
+
+except ``compile_stream``, which sends the compiled SKILL.md as it is
+written, in ``{"chunk": "..."}`` lines, before its final line (whose result
+holds the document's line count, byte count and SHA-256).
+
+A connection may carry any number of requests.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = os.environ.get(
+    "SKILLFORGE_SOCKET", str(Path(tempfile.gettempdir()) / "skillforge.sock")
+)
+
+# Generated SKILL.md files easily exceed asyncio's 64 KiB default line limit
+STREAM_LIMIT = 64 * 1024 * 1024
+
+# Streamed SKILL.md text is sent in chunks of about this many characters
+CHUNK_SIZE = 16 * 1024
+
+
+class ChunkWriter:
+    """Text stream that forwards writes as ``{"chunk": ...}`` protocol lines."""
+
+    def __init__(self, writer: asyncio.StreamWriter, chunk_size: int = CHUNK_SIZE):
+        self.writer = writer
+        self.chunk_size = chunk_size
+        self._pending: List[str] = []
+        self._pending_size = 0
+
+    def write(self, text: str) -> int:
+        # Small writes (section breaks) are coalesced; the transport sends
+        # each chunk as soon as the socket accepts it
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self.chunk_size:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self._pending:
+            chunk = "".join(self._pending)
+            self._pending.clear()
+            self._pending_size = 0
+            self.writer.write((json.dumps({"chunk": chunk}) + "\n").encode("utf-8"))
+
+
+class SkillForgeServer:
+    """Serves generate/compile/validate jobs from one resident engine."""
+
+    def __init__(
+        self,
+        engine=None,
+        socket_path: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: Optional[int] = None,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            engine: SkillForgeEngine to serve (created if not given)
+            socket_path: Unix socket path (default: $SKILLFORGE_SOCKET or
+                <tmp>/skillforge.sock); ignored when ``port`` is set
+            host: TCP host when serving on a port (localhost only by default)
+            port: Serve on this TCP port instead of a Unix socket
+        """
+        if engine is None:
+            try:
+                from .skillforge_engine import SkillForgeEngine
+            except ImportError:
+                from skillforge_engine import SkillForgeEngine
+            engine = SkillForgeEngine()
+
+        self.engine = engine
+        self.socket_path = socket_path or DEFAULT_SOCKET
+        self.host = host
+        self.port = port
+        self.started_at = None
+        self.requests_served = 0
+        self._server = None
+        # Whether the socket file at socket_path is this server's to remove
+        self._owns_socket = False
+
+        self.handlers = {
+            "ping": self._handle_ping,
+            "generate": self._handle_generate,
+            "compile": self._handle_compile,
+            "validate": self._handle_validate,
+        }
+
+    @property
+    def address(self) -> str:
+        """Human-readable listen address."""
+        return f"{self.host}:{self.port}" if self.port else self.socket_path
+
+    async def start(self) -> None:
+        """
+        Start listening.
+
+        Raises:
+            RuntimeError: If another daemon is already listening on the socket
+        """
+        if self.port:
+            self._server = await asyncio.start_server(
+                self._handle_connection, self.host, self.port, limit=STREAM_LIMIT
+            )
+        else:
+            await self._remove_stale_socket()
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, self.socket_path, limit=STREAM_LIMIT
+            )
+            self._owns_socket = True
+
+        self.started_at = time.time()
+        logger.info(f"SkillForge server listening on {self.address}")
+
+    async def _remove_stale_socket(self) -> None:
+        """Remove a socket file left behind by a daemon that is no longer running."""
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            _, writer = await asyncio.open_unix_connection(self.socket_path)
+        except ConnectionRefusedError:
+            # Nobody listening: a previous daemon exited without cleaning up
+            os.unlink(self.socket_path)
+            return
+        except FileNotFoundError:
+            return
+
+        writer.close()
+        await writer.wait_closed()
+        raise RuntimeError(f"SkillForge daemon already listening on {self.socket_path}")
+
+    async def serve_forever(self) -> None:
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop listening and remove the socket file."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.engine.close()
+        if self._owns_socket:
+            self._owns_socket = False
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def dispatch(self, request: Dict) -> Dict:
+        """Run one request and build its response."""
+        op = request.get("op")
+        handler = self.handlers.get(op)
+        if handler is None:
+            return {"ok": False, "error": f"Unknown op: {op!r}"}
+
+        try:
+            result = await handler(**request.get("params", {}))
+        except Exception as e:
+            logger.error(f"Error handling {op}: {e}", exc_info=True)
+            return {"ok": False, "error": str(e)}
+
+        self.requests_served += 1
+        return {"ok": True, "result": result}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer request lines until the client disconnects."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    response = {"ok": False, "error": f"Invalid JSON request: {e}"}
+                else:
+                    if not isinstance(request, dict):
+                        response = {"ok": False, "error": "Request must be a JSON object"}
+                    elif request.get("op") == "compile_stream":
+                        response = await self._stream_compile(request.get("params", {}), writer)
+                    else:
+                        response = await self.dispatch(request)
+
+                writer.write((json.dumps(response) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            logger.debug("Client disconnected")
+        finally:
+            writer.close()
+
+    async def _stream_compile(self, params: Dict, writer: asyncio.StreamWriter) -> Dict:
+        """
+        Compile SKILL.md into ``{"chunk": ...}`` lines on the connection.
+
+        Compiles in-process even when the engine has an executor, since the
+        output goes straight to this connection (Step 6 takes well under a
+        millisecond). Returns the final response line.
+        """
+        stream = ChunkWriter(writer)
+        try:
+            summary = self.engine.compile_skill_to(
+                params["scope_card"], params["canon"], params["overlay"], stream
+            )
+            stream.flush()
+        except Exception as e:
+            logger.error(f"Error handling compile_stream: {e}", exc_info=True)
+            return {"ok": False, "error": str(e)}
+
+        self.requests_served += 1
+        return {"ok": True, "result": summary}
+
+    async def _handle_ping(self) -> Dict:
+        return {
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started_at, 3) if self.started_at else 0,
+            "requests_served": self.requests_served,
+        }
+
+    async def _handle_generate(self, user_request: str) -> Dict:
+        # The daemon has no terminal to prompt on, so it always runs non-interactively
+        return await self.engine.generate_skill(user_request, interactive=False)
+
+    async def _handle_compile(self, scope_card: Dict, canon: Dict, overlay: Dict) -> Dict:
+        return {"skill_md": await self.engine.compile_skill(scope_card, canon, overlay)}
+
+    async def _handle_validate(self, skill_md: str, scope_card: Dict, canon: Dict) -> Dict:
+        return await self.engine.validate_skill(skill_md, scope_card, canon)
+
+
+class SkillForgeClient:
+    """Thin client that forwards jobs to a running SkillForge server."""
+
+    def __init__(self, socket_path: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Server Unix socket (default: $SKILLFORGE_SOCKET or
+                <tmp>/skillforge.sock); ignored when ``port`` is set
+            host: Server TCP host
+            port: Server TCP port
+        """
+        self.socket_path = socket_path or DEFAULT_SOCKET
+        self.host = host
+        self.port = port
+
+    async def request(self, op: str, **params) -> Any:
+        """
+        Send one request and return its result.
+
+        Raises:
+            ConnectionError: If no server is listening
+            RuntimeError: If the server reports an error
+        """
+        reader, writer = await self._send(op, params)
+        try:
+            line = await reader.readline()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+        return self._result(line)
+
+    async def compile_to(self, scope_card: Dict, canon: Dict, overlay: Dict, stream: TextIO) -> Dict:
+        """
+        Compile on the server, writing SKILL.md into ``stream`` as it arrives.
+
+        Returns:
+            Summary with the document's ``lines``, ``bytes`` and ``sha256``
+        """
+        reader, writer = await self._send(
+            "compile_stream", {"scope_card": scope_card, "canon": canon, "overlay": overlay}
+        )
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if "chunk" not in message:
+                    break
+                stream.write(message["chunk"])
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+        return self._result(line)
+
+    async def _send(self, op: str, params: Dict):
+        """Connect and send one request line; returns the (reader, writer) pair."""
+        if self.port:
+            reader, writer = await asyncio.open_connection(self.host, self.port, limit=STREAM_LIMIT)
+        else:
+            reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=STREAM_LIMIT)
+
+        try:
+            writer.write((json.dumps({"op": op, "params": params}) + "\n").encode("utf-8"))
+            await writer.drain()
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    @staticmethod
+    def _result(line: bytes) -> Any:
+        """Result of a final response line, raising on errors."""
+        if not line:
+            raise ConnectionError("Server closed the connection without responding")
+
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(f"SkillForge server error: {response.get('error')}")
+        return response["result"]
+
+    async def ping(self) -> Dict:
+        return await self.request("ping")
+
+    async def generate(self, user_request: str) -> Dict:
+        return await self.request("generate", user_request=user_request)
+
+    async def compile(self, scope_card: Dict, canon: Dict, overlay: Dict) -> str:
+        result = await self.request("compile", scope_card=scope_card, canon=canon, overlay=overlay)
+        return result["skill_md"]
+
+    async def validate(self, skill_md: str, scope_card: Dict, canon: Dict) -> Dict:
+        return await self.request("validate", skill_md=skill_md, scope_card=scope_card, canon=canon)
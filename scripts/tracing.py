@@ -0,0 +1,169 @@
+"""
+Tracing - Latency spans for SkillForge runs
+
+A Tracer records named start/end spans. The active tracer lives in a
+context variable, so code anywhere below a run (pipeline steps, NotebookLM
+queries, quality gates) can record spans with the module-level ``span()``
+helper without threading a tracer through every call; when no tracer is
+active, ``span()`` does nothing.
+
+Spans export to Chrome trace-event JSON, which opens in chrome://tracing
+or https://ui.perfetto.dev. Each asyncio task gets its own lane, so
+concurrent steps show up side by side.
+"""
+
+import asyncio
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+_current_tracer: ContextVar[Optional["Tracer"]] = ContextVar("skillforge_tracer", default=None)
+
+
+@dataclass
+class Span:
+    """A completed span; times are seconds since the tracer started."""
+    name: str
+    cat: str
+    start: float
+    end: float
+    lane: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class Tracer:
+    """Collects spans for one run."""
+
+    def __init__(self, name: str = "skillforge"):
+        """
+        Initialize the tracer.
+
+        Args:
+            name: Process name shown in trace viewers
+        """
+        self.name = name
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lanes: Dict[int, int] = {}
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Make this the current tracer for the enclosed code (and tasks it spawns)."""
+        token = _current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _current_tracer.reset(token)
+
+    @contextmanager
+    def span(self, name: str, cat: str = "pipeline", **args) -> Iterator[Dict[str, Any]]:
+        """
+        Record a span around the enclosed code.
+
+        Yields the span's args dict, so callers can attach results
+        (e.g. ``args["cache"] = "hit"``). Failed spans get an ``error`` arg.
+        """
+        lane = self._lane()
+        start = time.perf_counter()
+        try:
+            yield args
+        except BaseException as e:
+            args["error"] = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            self.spans.append(Span(name, cat, start - self.origin, end - self.origin, lane, args))
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Spans as plain dicts, ordered by start time."""
+        return [
+            {
+                "name": s.name,
+                "cat": s.cat,
+                "start": round(s.start, 6),
+                "end": round(s.end, 6),
+                "duration": round(s.duration, 6),
+                "lane": s.lane,
+                "args": s.args,
+            }
+            for s in sorted(self.spans, key=lambda s: s.start)
+        ]
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace-event JSON for this tracer's spans."""
+        return chrome_trace(self.summary(), process_name=self.name)
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Write Chrome trace-event JSON to ``path`` and return the path."""
+        return write_chrome_trace(self.summary(), path, process_name=self.name)
+
+    def _lane(self) -> int:
+        """Lane (trace-viewer thread) for the current asyncio task."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else 0
+        if key not in self._lanes:
+            self._lanes[key] = len(self._lanes)
+        return self._lanes[key]
+
+
+def current_tracer() -> Optional[Tracer]:
+    """The tracer active in the current context, if any."""
+    return _current_tracer.get()
+
+
+@contextmanager
+def span(name: str, cat: str = "pipeline", **args) -> Iterator[Dict[str, Any]]:
+    """Record a span on the current tracer; a no-op when none is active."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield args
+        return
+    with tracer.span(name, cat, **args) as span_args:
+        yield span_args
+
+
+def chrome_trace(spans: List[Dict[str, Any]], process_name: str = "skillforge") -> Dict[str, Any]:
+    """
+    Convert span dicts (``Tracer.summary()`` / ``result["timings"]["spans"]``)
+    to Chrome trace-event JSON.
+    """
+    pid = os.getpid()
+    events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": process_name}}]
+
+    for lane in sorted({s["lane"] for s in spans}):
+        events.append({
+            "name": "thread_name", "ph": "M", "pid": pid, "tid": lane,
+            "args": {"name": "main" if lane == 0 else f"task-{lane}"},
+        })
+
+    for s in spans:
+        events.append({
+            "name": s["name"],
+            "cat": s["cat"],
+            "ph": "X",
+            "ts": round(s["start"] * 1e6, 3),
+            "dur": round(s["duration"] * 1e6, 3),
+            "pid": pid,
+            "tid": s["lane"],
+            "args": s.get("args", {}),
+        })
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(spans: List[Dict[str, Any]], path: str, process_name: str = "skillforge") -> str:
+    """Write span dicts as Chrome trace-event JSON and return the path."""
+    with open(path, "w") as f:
+        json.dump(chrome_trace(spans, process_name), f, default=str)
+    return str(path)
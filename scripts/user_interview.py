@@ -9,6 +9,7 @@ Collects local constraints and preferences via 5 key questions:
 5. Historical failure patterns
 """
 
+import asyncio
 import json
 import logging
 from typing import Dict, List, Optional
@@ -76,7 +77,7 @@ class UserInterview:
         if interactive:
             return await self._interview_interactive(scope_card)
         else:
-            return self._interview_defaults(scope_card)
+            return await self._interview_defaults(scope_card)
 
     async def _interview_interactive(self, scope_card: Dict) -> Dict:
         """Interactive interview mode."""
@@ -92,7 +93,9 @@ class UserInterview:
             print(f"\n{i}. {q_data['question']}")
             print(f"   {q_data['help']}")
 
-            answer = input("   > ").strip()
+            # Read stdin off the event loop so concurrent steps (e.g. Step 3
+            # canon collection) keep running while the user types
+            answer = (await asyncio.to_thread(input, "   > ")).strip()
 
             if not answer:
                 print("   [Skipped - will use defaults]")
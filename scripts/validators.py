@@ -15,6 +15,11 @@ import logging
 import re
 from typing import Dict, List, Tuple, Optional
 
+try:
+    from .tracing import span
+except ImportError:
+    from tracing import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,7 +86,9 @@ class SkillValidator:
         }
 
         for gate in self.gates:
-            passed, message, details = gate.validate(skill_md, scope_card, canon)
+            with span(gate.name, "quality_gate") as span_args:
+                passed, message, details = gate.validate(skill_md, scope_card, canon)
+                span_args["passed"] = passed
 
             gate_result = {
                 "name": gate.name,
@@ -0,0 +1,78 @@
+"""
+Regression tests for the NotebookLM rate limiter.
+
+Run with ``python -m unittest discover tests`` (or pytest).
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from rate_limiter import AdaptiveLimiter, ThrottledError, is_throttled  # noqa: E402
+
+
+class IsThrottledTest(unittest.TestCase):
+    def test_throttling_errors(self):
+        for message in (
+            "429 Too Many Requests",
+            "HTTP 429",
+            "Rate limit exceeded, retry later",
+            "rate-limited by upstream",
+            "Request throttled",
+            "Quota exceeded for notebook queries",
+            "You have exceeded your quota",
+            "RESOURCE_EXHAUSTED",
+        ):
+            with self.subTest(message=message):
+                self.assertTrue(is_throttled(RuntimeError(message)))
+        self.assertTrue(is_throttled(ThrottledError()))
+
+    def test_errors_that_only_contain_markers(self):
+        for message in (
+            "404 Notebook not found: nb_4291",
+            "Source quota_sheet.pdf failed to parse",
+            "timeout after 1429 ms",
+            "Connection reset by peer",
+        ):
+            with self.subTest(message=message):
+                self.assertFalse(is_throttled(RuntimeError(message)))
+
+
+class ReleaseTest(unittest.TestCase):
+    def test_cancelled_release_frees_slot(self):
+        async def scenario():
+            limiter = AdaptiveLimiter(rate=1000, burst=100, initial_concurrency=2, max_concurrency=2)
+
+            async def work():
+                await asyncio.sleep(0.01)
+                return 1
+
+            calls = [asyncio.ensure_future(limiter.call(work)) for _ in range(2)]
+            await asyncio.sleep(0.005)
+
+            # Hold the lock so both calls finish and block in _release, then
+            # cancel them there
+            changed = limiter._condition()
+            await changed.acquire()
+            await asyncio.sleep(0.02)
+            for call in calls:
+                call.cancel()
+            await asyncio.sleep(0)
+            changed.release()
+            await asyncio.gather(*calls, return_exceptions=True)
+            self.assertEqual(limiter.in_flight, 0)
+
+            # Both slots are usable again
+            results = await asyncio.wait_for(asyncio.gather(*(limiter.call(work) for _ in range(4))), 1.0)
+            self.assertEqual(results, [1, 1, 1, 1])
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()